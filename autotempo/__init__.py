@@ -0,0 +1,67 @@
+"""
+AutoTempo - manage JIRA worklogs using the Tempo Timesheets API.
+
+Importing the package has no side effects: config.toml is read on first use
+(call ``config.load(path)`` to use a different file), and the HTTP stack is
+only imported by the functions that talk to JIRA.
+"""
+
+from .config import config
+from .errors import FatalError
+
+def apply(file_path, jobs=1, pipeline=False):
+    """Applies the worklogs from a .jira file, or a list of files or glob patterns, to Tempo, like the apply command."""
+    from .worklogs import process_worklog_file
+    return process_worklog_file(file_path, jobs, pipeline)
+
+def plan(file_path, plan_path=None):
+    """Writes the changes a worklog file, or a list of files or glob patterns, would make to a JSON plan file, like the plan command."""
+    from .plan import create_plan
+    return create_plan(file_path, plan_path)
+
+def apply_plan(plan_path, jobs=1):
+    """Applies a plan file without asking for confirmation, like apply --plan."""
+    from .plan import apply_plan
+    return apply_plan(plan_path, jobs)
+
+def validate(file_path):
+    """Validates a .jira file, or a list of files or glob patterns, like the validate command. Returns True if they are valid."""
+    from .worklogs import validate_worklog_file
+    return validate_worklog_file(file_path)
+
+def generate(month):
+    """Writes YYYY-MM.jira templates for a YYYY-MM month or YYYY-MM..YYYY-MM range, like the generate command."""
+    from .template import generate_template
+    return generate_template(month)
+
+def inspect(repo_paths, scan_directory=None, month=None, since=None, until=None, jobs=4):
+    """Prints a draft worklog based on the Git history of one or more repositories, like the inspect command."""
+    from .gitlog import inspect_git_repo
+    return inspect_git_repo(repo_paths, scan_directory, month, since, until, jobs)
+
+def report(start_date, end_date, group_by="ticket", output_format="table", output_path=None):
+    """Prints the time logged between two dates grouped by ticket, account, component, day or month, like the report command."""
+    from .report import report_worklogs
+    return report_worklogs(start_date, end_date, group_by, output_format, output_path)
+
+def export(start_date, end_date, output_format="jsonl", output_path=None):
+    """Writes the worklogs logged between two dates as JSON lines or CSV, like the export command."""
+    from .transfer import export_worklogs
+    return export_worklogs(start_date, end_date, output_format, output_path)
+
+def import_file(file_path, jobs=1, validate_only=False):
+    """Validates and applies the worklog records of a JSON lines or CSV file, like the import command."""
+    from .transfer import import_worklogs
+    return import_worklogs(file_path, jobs, validate_only)
+
+def watch(file_path, interval=1.0, debounce=2.0, jobs=1):
+    """Applies a worklog file whenever it changes until interrupted, like the watch command."""
+    from .watch import watch_worklog_file
+    return watch_worklog_file(file_path, interval, debounce, jobs)
+
+def team(directory, jobs=1, validate_only=False):
+    """Validates and applies the .jira files of a whole team, like the team command."""
+    from .team import process_team_directory
+    return process_team_directory(directory, jobs, validate_only)
+
+__all__ = ["FatalError", "apply", "apply_plan", "config", "export", "generate", "import_file", "inspect", "plan", "report", "team", "validate", "watch"]
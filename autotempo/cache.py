@@ -0,0 +1,65 @@
+import hashlib
+import json
+import os
+import time
+
+from .config import config
+
+# Set by --refresh, cached values are ignored and replaced with freshly fetched ones
+REFRESH_CACHE = False
+
+# Cache contents, loaded on first use by load_cache()
+_cache = None
+
+def instance_key():
+    """Identifies the JIRA instance and user; the token is hashed so it never ends up on disk."""
+    return hashlib.sha256(f"{config.jira_url}\n{config.api_token}".encode()).hexdigest()[:16]
+
+def cache_path():
+    # The cache is per JIRA instance and user
+    return os.path.join(config.cache["dir"], f"{instance_key()}.json")
+
+def load_cache():
+    global _cache
+    if _cache is None:
+        _cache = {}
+        if config.cache["enabled"]:
+            try:
+                with open(cache_path(), "r") as f:
+                    _cache = json.load(f)
+            except (OSError, ValueError):
+                pass  # A missing or corrupted cache is simply rebuilt
+    return _cache
+
+def save_cache():
+    if not config.cache["enabled"] or _cache is None:
+        return
+    path = cache_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(_cache, f)
+        os.replace(temp_path, path)
+    except OSError as e:
+        print(f"Warning: could not write cache file {path}: {e}")
+
+def cache_get(*keys):
+    """Returns the value cached under the nested keys, or None if it is missing, expired or --refresh was given."""
+    if REFRESH_CACHE:
+        return None
+    entry = load_cache()
+    for key in keys:
+        if not isinstance(entry, dict) or key not in entry:
+            return None
+        entry = entry[key]
+    if time.time() - entry.get("fetched", 0) > config.cache["ttl"]:
+        return None
+    return entry.get("value")
+
+def cache_put(value, *keys):
+    """Stores the value under the nested keys. Call save_cache() to write it to disk."""
+    entry = load_cache()
+    for key in keys[:-1]:
+        entry = entry.setdefault(key, {})
+    entry[keys[-1]] = {"value": value, "fetched": time.time()}
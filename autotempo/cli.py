@@ -0,0 +1,135 @@
+import argparse
+
+from . import cache, metrics
+from .errors import FatalError
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="autotempo", description="Manage JIRA worklogs using Tempo.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    # Options shared by the commands talking to JIRA
+    cache_parser = argparse.ArgumentParser(add_help=False)
+    cache_parser.add_argument("--refresh", action="store_true", help="Ignore the cached worker ID, working days and apply journal and ask the server again")
+    cache_parser.add_argument("--metrics", action="store_true", help="Record the latency of every request and the time of each phase, and print a summary at exit")
+    cache_parser.add_argument("--metrics-json", metavar="FILE", help="Also write the metrics to FILE as JSON (implies --metrics)")
+
+    # Apply command
+    apply_parser = subparsers.add_parser("apply", parents=[cache_parser], help="Apply worklogs from a file")
+    apply_parser.add_argument("files", nargs="*", metavar="file", help="Path to a text file containing worklog entries; several files or glob patterns are applied together")
+    apply_parser.add_argument("--plan", help="Apply a plan file made by the plan command, without asking for confirmation")
+    apply_parser.add_argument("--jobs", "-j", type=int, default=1, help="Number of days to apply in parallel (default: 1)")
+    apply_parser.add_argument("--pipeline", action="store_true", help="Fetch upcoming days and write confirmed ones in the background while prompting")
+
+    # Plan command
+    plan_parser = subparsers.add_parser("plan", parents=[cache_parser], help="Compute the changes of a worklog file and write them to a plan file")
+    plan_parser.add_argument("files", nargs="+", metavar="file", help="Path to a text file containing worklog entries; several files or glob patterns are planned together")
+    plan_parser.add_argument("--output", "-o", help="Path of the plan file (default: <file>.plan.json, required for several files or a glob pattern)")
+
+    # Generate command
+    generate_parser = subparsers.add_parser("generate", parents=[cache_parser], help="Generate worklog templates for a month or a range of months")
+    generate_parser.add_argument("month", help="Month in the format YYYY-MM, or a range of months YYYY-MM..YYYY-MM")
+
+    # Inspect command
+    inspect_parser = subparsers.add_parser("inspect", help="Inspect Git repositories and generate a draft worklog based on commits")
+    inspect_parser.add_argument("repo_paths", nargs="*", metavar="repo_path", help="Path to a Git repository")
+    inspect_parser.add_argument("--scan", metavar="DIRECTORY", help="Also inspect every Git repository found under this directory")
+    inspect_parser.add_argument("--month", help="Only inspect commits of this month, in the format YYYY-MM")
+    inspect_parser.add_argument("--since", help="Only inspect commits on or after this date, in the format YYYY-MM-DD")
+    inspect_parser.add_argument("--until", help="Only inspect commits on or before this date, in the format YYYY-MM-DD")
+    inspect_parser.add_argument("--jobs", "-j", type=int, default=4, help="Number of repositories read in parallel (default: 4)")
+
+    # Validate command
+    validate_parser = subparsers.add_parser("validate", parents=[cache_parser], help="Validate worklogs from a file without applying them")
+    validate_parser.add_argument("files", nargs="+", metavar="file", help="Path to a text file containing worklog entries; several files or glob patterns are validated together")
+
+    # Team command
+    team_parser = subparsers.add_parser("team", parents=[cache_parser], help="Validate and apply the worklog files of a whole team")
+    team_parser.add_argument("directory", help="Directory with one <user key>.jira file per user")
+    team_parser.add_argument("--jobs", "-j", type=int, default=1, help="Number of days to apply in parallel (default: 1)")
+    team_parser.add_argument("--validate-only", action="store_true", help="Only validate the files, do not apply them")
+
+    # Watch command
+    watch_parser = subparsers.add_parser("watch", parents=[cache_parser], help="Keep applying a worklog file whenever it changes")
+    watch_parser.add_argument("file", help="Path to the text file containing worklog entries")
+    watch_parser.add_argument("--interval", type=float, default=1.0, help="Seconds between checks of the file (default: 1)")
+    watch_parser.add_argument("--debounce", type=float, default=2.0, help="Seconds the file must stay unchanged before it is synced (default: 2)")
+    watch_parser.add_argument("--jobs", "-j", type=int, default=1, help="Number of days to apply in parallel (default: 1)")
+
+    # Report command
+    report_parser = subparsers.add_parser("report", parents=[cache_parser], help="Sum up logged time over a date range")
+    report_parser.add_argument("--from", dest="start_date", required=True, metavar="YYYY-MM-DD", help="First day of the report")
+    report_parser.add_argument("--to", dest="end_date", required=True, metavar="YYYY-MM-DD", help="Last day of the report")
+    report_parser.add_argument("--group-by", default="ticket", help="Comma separated fields to group by: ticket, account, component, day, month (default: ticket)")
+    report_parser.add_argument("--format", choices=["table", "csv"], default="table", help="Output format (default: table)")
+    report_parser.add_argument("--output", "-o", help="Write the report to this file instead of the standard output")
+
+    # Export command
+    export_parser = subparsers.add_parser("export", parents=[cache_parser], help="Write your worklogs over a date range as JSON lines or CSV")
+    export_parser.add_argument("--from", dest="start_date", required=True, metavar="YYYY-MM-DD", help="First day to export")
+    export_parser.add_argument("--to", dest="end_date", required=True, metavar="YYYY-MM-DD", help="Last day to export")
+    export_parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl", help="Output format (default: jsonl)")
+    export_parser.add_argument("--output", "-o", help="Write the worklogs to this file instead of the standard output")
+
+    # Import command
+    import_parser = subparsers.add_parser("import", parents=[cache_parser], help="Validate and apply worklog records from a JSON lines or CSV file")
+    import_parser.add_argument("file", help="Path to a .jsonl or .csv file with date, hours, ticket, account, component and comment fields")
+    import_parser.add_argument("--jobs", "-j", type=int, default=1, help="Number of days to apply in parallel (default: 1)")
+    import_parser.add_argument("--validate-only", action="store_true", help="Only validate the file, do not apply it")
+
+    return parser, apply_parser
+
+def main(argv=None):
+    parser, apply_parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "apply" and bool(args.files) == bool(args.plan):
+        apply_parser.error("either a worklog file or --plan is required")
+    cache.REFRESH_CACHE = getattr(args, "refresh", False)
+    metrics.ENABLED = getattr(args, "metrics", False) or bool(getattr(args, "metrics_json", None))
+
+    try:
+
+        # Command modules are imported on demand, so --help and inspect never load the HTTP stack.
+        # The JIRA user is looked up by the first call that needs it.
+        if args.command == "apply" and args.plan:
+            from .plan import apply_plan
+            apply_plan(args.plan, args.jobs)
+        elif args.command == "apply":
+            from .worklogs import process_worklog_file
+            process_worklog_file(args.files, args.jobs, args.pipeline)
+        elif args.command == "plan":
+            from .plan import create_plan
+            create_plan(args.files, args.output)
+        elif args.command == "validate":
+            from .worklogs import validate_worklog_file
+            validate_worklog_file(args.files)
+        elif args.command == "generate":
+            from .template import generate_template
+            generate_template(args.month)
+        elif args.command == "inspect":
+            from .gitlog import inspect_git_repo
+            inspect_git_repo(args.repo_paths, args.scan, args.month, args.since, args.until, args.jobs)
+        elif args.command == "watch":
+            from .watch import watch_worklog_file
+            watch_worklog_file(args.file, args.interval, args.debounce, args.jobs)
+        elif args.command == "report":
+            from .report import report_worklogs
+            report_worklogs(args.start_date, args.end_date, args.group_by, args.format, args.output)
+        elif args.command == "export":
+            from .transfer import export_worklogs
+            export_worklogs(args.start_date, args.end_date, args.format, args.output)
+        elif args.command == "import":
+            from .transfer import import_worklogs
+            import_worklogs(args.file, args.jobs, args.validate_only)
+        elif args.command == "team":
+            from .team import process_team_directory
+            process_team_directory(args.directory, args.jobs, args.validate_only)
+    except FatalError as e:
+        print(f"Fatal error: {e}")
+        exit(1)
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+        exit(1)
+    finally:
+        # Also reported when the command fails, since that is when the numbers are most useful
+        if metrics.ENABLED:
+            metrics.report(args.metrics_json)
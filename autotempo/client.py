@@ -0,0 +1,133 @@
+import datetime
+import email.utils
+import threading
+import time
+
+import requests
+
+from . import metrics
+from .config import config
+
+# Responses worth retrying: rate limiting and transient gateway errors
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+
+# Shared HTTP session and rate limiter, created on first use
+_session = None
+_rate_limiter = None
+_rate_limit_enabled = False
+_lock = threading.Lock()
+
+class RateLimiter:
+    """
+    Token bucket shared by all threads. Allows `rate` requests per second on average,
+    with bursts of up to `rate` requests. A rate of 0 disables the limit.
+    """
+    def __init__(self, rate):
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until a request may be sent."""
+        if not self.rate:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+def get_session():
+    """Returns the shared keep-alive session used for all JIRA and Tempo calls."""
+    global _session
+    with _lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers.update({
+                "Accept": "application/json",
+                "Authorization": f"Bearer {config.api_token}"
+            })
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=config.http["pool_size"])
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+    return _session
+
+def enable_rate_limit():
+    """
+    Makes all following requests share the rate limiter. Called when writes start running on several
+    threads (--jobs N); a sequential run sends one request at a time and is never limited.
+    """
+    global _rate_limit_enabled
+    _rate_limit_enabled = True
+
+def get_rate_limiter():
+    """Returns the rate limiter shared by all threads, see the rate_limit setting, or None until it is enabled."""
+    global _rate_limiter
+    if not _rate_limit_enabled:
+        return None
+    with _lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter(config.http["rate_limit"])
+    return _rate_limiter
+
+def parse_retry_after(response):
+    """Returns the delay in seconds requested by the Retry-After header, or None."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+def api_request(method, path, payload=None, idempotent=True):
+    """
+    Sends a request to the JIRA URL + path through the shared session.
+
+    Idempotent requests are retried with exponential backoff on connection errors,
+    timeouts and RETRY_STATUS_CODES responses. A 429 response means the request was
+    not processed, so it is retried for non-idempotent requests as well.
+    The Retry-After header takes precedence over the computed backoff.
+
+    Returns the last response; connection errors are raised once retries run out.
+    With --metrics, the call is recorded with its total latency, including retries.
+    """
+    settings = config.http
+    url = f"{config.jira_url}{path}"
+    session = get_session()
+    attempt = 0
+    start = time.perf_counter()
+    while True:
+        rate_limiter = get_rate_limiter()
+        if rate_limiter:
+            rate_limiter.acquire()
+        try:
+            response = session.request(method, url, json=payload, timeout=settings["timeout"])
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if not idempotent or attempt >= settings["retries"]:
+                metrics.record_request(method, path, type(e).__name__, time.perf_counter() - start, attempt)
+                raise
+            delay = settings["backoff"] * 2 ** attempt
+        else:
+            retryable = response.status_code == 429 or (idempotent and response.status_code in RETRY_STATUS_CODES)
+            if not retryable or attempt >= settings["retries"]:
+                metrics.record_request(method, path, response.status_code, time.perf_counter() - start, attempt)
+                return response
+            delay = parse_retry_after(response)
+            if delay is None:
+                delay = settings["backoff"] * 2 ** attempt
+        attempt += 1
+        time.sleep(delay)
@@ -0,0 +1,168 @@
+import os
+
+from . import metrics
+from .errors import FatalError
+
+CONFIG_TEMPLATE = """
+[JIRA]
+JIRA_URL = "https://your-jira-instance.atlassian.net" # Replace with your JIRA URL
+API_TOKEN = "your-api-token"                          # Replace with your JIRA API Token
+
+[user]
+email = "your-email@example.com"                      # Your email address (used for git inspect)
+
+# Define keywords for common tasks (optional)
+[keyword.meeting]
+ticket = "INTERNAL-123"
+account = "001-GEN"
+component = "Meetings"
+
+[keyword.training]
+ticket = "INTERNAL-456"
+account = "001-GEN"
+component = "Learning"
+
+[keyword.scrum]
+ticket = "INTERNAL-123"
+account = "001-GEN"
+component = "Meetings"
+
+# Define default account/component for specific JIRA projects (optional)
+[project.PROJ]
+account = "002-PROJ"
+component = "Project"
+
+# Automatic worklogs (optional)
+# day_of_week can be a comma-separated list of days (e.g., "Monday,Wednesday,Friday")
+# or ranges (e.g., "Mon-Fri"). Short names are also supported (e.g. "Mon", "Tue").
+# [[automatic]]
+# day_of_week = "Mon-Thu"
+# worklogs = ["0.25 scrum \"Daily Scrum\""]
+#
+# [[automatic]]
+# day_of_week = "Friday"
+# worklogs = [
+#   "0.25 scrum \"Daily Scrum\"",
+#   "1.0 scrum \"Sprint Planning\"",
+#   "0.5 scrum \"Sprint Retro\""
+# ]
+"""
+
+class Config:
+    """
+    Settings from config.toml. The file is read on first access, so importing autotempo
+    has no side effects and commands that do not need the configuration never touch it.
+    """
+    def __init__(self, path="config.toml"):
+        self.path = path
+        self._data = None
+
+    def load(self, path=None):
+        """(Re)loads the configuration, optionally from a different file."""
+        import toml
+
+        if path is not None:
+            self.path = path
+        try:
+            with metrics.phase("config"):
+                data = toml.load(self.path)
+        except FileNotFoundError:
+            raise FatalError(
+                f"Configuration file '{self.path}' not found.\n\n"
+                f"Please create '{self.path}' with the following content:\n"
+                + "-" * 40 + "\n" + CONFIG_TEMPLATE.strip() + "\n" + "-" * 40
+            )
+        except toml.TomlDecodeError as e:
+            raise FatalError(f"Invalid configuration file '{self.path}'", e)
+
+        try:
+            data["JIRA"]["JIRA_URL"]
+            data["JIRA"]["API_TOKEN"]
+            data["keyword"]
+            data["user"]["email"]
+        except KeyError as e:
+            raise FatalError(f"Missing configuration key: {e}")
+
+        self._data = data
+        return self
+
+    @property
+    def data(self):
+        if self._data is None:
+            self.load()
+        return self._data
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __contains__(self, key):
+        return key in self.data
+
+    @property
+    def jira_url(self):
+        return self.data["JIRA"]["JIRA_URL"]
+
+    @property
+    def api_token(self):
+        return self.data["JIRA"]["API_TOKEN"]
+
+    @property
+    def email(self):
+        return self.data["user"]["email"]
+
+    @property
+    def keywords(self):
+        return self.data["keyword"]
+
+    @property
+    def projects(self):
+        return self.data.get("project", {})
+
+    @property
+    def http(self):
+        """HTTP client settings from the optional [http] section, with defaults filled in."""
+        http_config = self.data.get("http", {})
+        return {
+            "timeout": http_config.get("timeout", 30),
+            "retries": http_config.get("retries", 4),
+            "backoff": http_config.get("backoff", 0.5),
+            "pool_size": http_config.get("pool_size", 10),
+            "rate_limit": http_config.get("rate_limit", 10),
+        }
+
+    @property
+    def cache(self):
+        """On-disk cache settings from the optional [cache] section, with defaults filled in."""
+        cache_config = self.data.get("cache", {})
+        default_dir = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "autotempo")
+        return {
+            "enabled": cache_config.get("enabled", True),
+            "ttl": cache_config.get("ttl_days", 7) * 24 * 3600,
+            "dir": cache_config.get("dir", default_dir),
+        }
+
+    @property
+    def journal(self):
+        """Apply journal settings from the optional [journal] section, with defaults filled in."""
+        journal_config = self.data.get("journal", {})
+        default_dir = os.path.join(os.environ.get("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state"), "autotempo")
+        return {
+            "enabled": journal_config.get("enabled", True),
+            "dir": journal_config.get("dir", default_dir),
+        }
+
+    @property
+    def mirror(self):
+        """Local worklog mirror settings from the optional [mirror] section, with defaults filled in."""
+        mirror_config = self.data.get("mirror", {})
+        return {
+            "enabled": mirror_config.get("enabled", False),
+            # Default: <instance key>.sqlite3 in the cache directory
+            "path": mirror_config.get("path"),
+        }
+
+# The configuration used by all commands; call config.load(path) to use another file
+config = Config()
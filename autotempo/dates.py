@@ -0,0 +1,30 @@
+import datetime
+
+def month_bounds(month):
+    """Returns the first and the last day of a YYYY-MM month as YYYY-MM-DD strings."""
+    start_date = datetime.datetime.strptime(f"{month}-01", "%Y-%m-%d")
+    end_date = (start_date + datetime.timedelta(days=31)).replace(day=1) - datetime.timedelta(days=1)
+    return start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
+
+def date_ranges(dates, max_gap_days=31):
+    """
+    Splits YYYY-MM-DD dates into (first date, last date) ranges, starting a new range wherever more
+    than max_gap_days days separate two dates, so that fetching every range skips the long gaps.
+    """
+    ranges = []
+    for date in sorted(set(dates)):
+        day = datetime.date.fromisoformat(date)
+        if ranges and (day - datetime.date.fromisoformat(ranges[-1][1])).days <= max_gap_days:
+            ranges[-1][1] = date
+        else:
+            ranges.append([date, date])
+    return [tuple(date_range) for date_range in ranges]
+
+def months_between(start_date, end_date):
+    """Returns the YYYY-MM months overlapping the range from start_date to end_date."""
+    year, month = int(start_date[:4]), int(start_date[5:7])
+    months = []
+    while f"{year:04d}-{month:02d}" <= end_date[:7]:
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
@@ -0,0 +1,10 @@
+class FatalError(Exception):
+    """Custom exception for fatal errors."""
+    def __init__(self, message, original_exception=None):
+        super().__init__(message)
+        self.original_exception = original_exception
+
+    def __str__(self):
+        if self.original_exception:
+            return f"{super().__str__()} (original exception: {self.original_exception})"
+        return super().__str__()
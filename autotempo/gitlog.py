@@ -0,0 +1,139 @@
+import concurrent.futures
+import datetime
+import os
+import re
+import subprocess
+
+from .config import config
+from .dates import month_bounds
+from .errors import FatalError
+from .tempo import ISSUE_KEY_PATTERN
+
+# JIRA issue keys mentioned in commit messages, e.g. PROJ-123
+TICKET_PATTERN = re.compile(rf"\b({ISSUE_KEY_PATTERN.pattern})\b")
+
+# Time credited to the first commit of a day, which has no earlier commit to measure from
+FIRST_COMMIT_SECONDS = 3600
+# Longest gap between two commits that is credited to the later one
+MAX_COMMIT_GAP_SECONDS = 4 * 3600
+# Hours of a day are split between tickets in quarters of an hour
+QUARTERS_PER_DAY = 8 * 4
+
+def find_git_repos(directory):
+    """Returns the Git repositories found under directory, without descending into them."""
+    repos = []
+    for root, dirs, files in os.walk(directory):
+        if ".git" in dirs or ".git" in files:
+            repos.append(root)
+            dirs[:] = []
+        else:
+            dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+    return repos
+
+def read_commits(repo_path, since=None, until=None):
+    """
+    Streams the commits of the configured user authored between since and until (inclusive) from a repository.
+    Returns a dict mapping each commit hash to (authored at, subject), read line by line from git log.
+    """
+    command = ["git", "-C", repo_path, "log", "--author", config.email, "--pretty=format:%H%x09%ad%x09%s", "--date=iso-strict"]
+    if since:
+        # git filters by commit date, which is never before the author date, so this only
+        # prunes commits that are out of range. The exact range is checked below.
+        command.append(f"--since={since} 00:00:00")
+
+    commits = {}
+    try:
+        with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, errors="replace") as process:
+            for line in process.stdout:
+                commit_hash, authored_at, message = line.rstrip("\n").split("\t", 2)
+                if (since and authored_at[:10] < since) or (until and authored_at[:10] > until):
+                    continue
+                commits[commit_hash] = (datetime.datetime.fromisoformat(authored_at), message)
+            stderr = process.stderr.read()
+    except OSError as e:
+        raise FatalError(f"Failed to run git for {repo_path}", e)
+    if process.returncode != 0:
+        raise FatalError(f"Failed to retrieve commits from Git repository {repo_path}: {stderr.strip()}")
+    return commits
+
+def find_tickets(message):
+    """
+    Returns the issue keys named in a commit message, in order and without duplicates. When [project.*]
+    sections are configured, only keys of those projects are kept, so that e.g. UTF-8 or SHA-256 are not
+    taken for issues.
+    """
+    projects = config.projects
+    tickets = [ticket for ticket in TICKET_PATTERN.findall(message) if not projects or ticket.rsplit("-", 1)[0] in projects]
+    return list(dict.fromkeys(tickets))
+
+def split_day(commits):
+    """
+    Splits the 8 hours of a day between tickets. Every commit is credited with the time since the
+    previous commit of the day (FIRST_COMMIT_SECONDS for the first one), capped at MAX_COMMIT_GAP_SECONDS,
+    and attributed to the tickets named in its message, or to a placeholder if it names none.
+    Returns a list of (ticket, quarters of an hour, commit messages), summing to QUARTERS_PER_DAY.
+    """
+    weights = {}
+    messages = {}
+    previous = None
+    for authored_at, message in sorted(commits):
+        if previous is None:
+            seconds = FIRST_COMMIT_SECONDS
+        else:
+            seconds = min(max((authored_at - previous).total_seconds(), 60), MAX_COMMIT_GAP_SECONDS)
+        previous = authored_at
+        tickets = find_tickets(message) or ["jira-ticket"]
+        for ticket in tickets:
+            weights[ticket] = weights.get(ticket, 0) + seconds / len(tickets)
+            messages.setdefault(ticket, []).append(message)
+
+    # Largest remainder rounding, so that the quarters add up to exactly a full day
+    total = sum(weights.values())
+    shares = {ticket: weight * QUARTERS_PER_DAY / total for ticket, weight in weights.items()}
+    quarters = {ticket: int(share) for ticket, share in shares.items()}
+    for ticket in sorted(shares, key=lambda ticket: quarters[ticket] - shares[ticket])[:QUARTERS_PER_DAY - sum(quarters.values())]:
+        quarters[ticket] += 1
+
+    return [(ticket, quarters[ticket], messages[ticket]) for ticket in weights if quarters[ticket]]
+
+def format_comment(messages):
+    comment = "; ".join(dict.fromkeys(message.strip() for message in messages))
+    return comment.replace('"', "'")
+
+def inspect_git_repos(repo_paths, since=None, until=None, jobs=4):
+    """
+    Builds a draft worklog from the commits of the configured user in several repositories.
+    The git log processes run in parallel; commits are merged per day and each day's 8 hours
+    are split between the ticket keys found in the commit messages.
+    Returns the draft as the content of a .jira file.
+    """
+    commits = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        for repo_commits in executor.map(lambda repo_path: read_commits(repo_path, since, until), repo_paths):
+            # Keyed by hash, so a repository checked out twice is only counted once
+            commits.update(repo_commits)
+
+    commits_by_day = {}
+    for authored_at, message in commits.values():
+        commits_by_day.setdefault(authored_at.date().isoformat(), []).append((authored_at, message))
+
+    worklog_lines = [f"# Generated from the commits of {config.email} in {len(repo_paths)} repositories"]
+    for day in sorted(commits_by_day):
+        for ticket, quarters, messages in split_day(commits_by_day[day]):
+            worklog_lines.append(f"{day} {quarters / 4} {ticket} \"{format_comment(messages)}\"")
+    return "\n".join(worklog_lines) + "\n"
+
+def inspect_git_repo(repo_paths, scan_directory=None, month=None, since=None, until=None, jobs=4):
+    """Prints a draft worklog generated from the commits in the given repositories and/or a scanned directory."""
+    if isinstance(repo_paths, str):
+        repo_paths = [repo_paths]
+    repo_paths = list(repo_paths or [])
+    if scan_directory:
+        repo_paths += find_git_repos(scan_directory)
+    if not repo_paths:
+        raise FatalError("No Git repositories to inspect.")
+
+    if month:
+        since, until = month_bounds(month)
+
+    print(inspect_git_repos(repo_paths, since, until, jobs), end="")
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from .cache import instance_key
+from .config import config
+from .parser import WorklogEntry
+
+# The journal is compacted on load once it holds this many records more than needed
+COMPACT_THRESHOLD = 1000
+
+def day_hash(entries):
+    """Returns a hash of the worklogs of a day, independent of their order in the file."""
+    keys = sorted(entry.key() for entry in entries)
+    return hashlib.sha256(json.dumps(keys).encode()).hexdigest()
+
+def entry_to_record(entry):
+    return [entry.ticket, entry.seconds, entry.account, entry.component, entry.comment]
+
+def entry_from_record(date, record):
+    ticket, seconds, account, component, comment = record
+    return WorklogEntry(date, seconds, ticket, account, component, comment)
+
+def operations_to_records(worklogs_to_delete, worklogs_to_update, worklogs_to_add):
+    """Serializes the operations of a day update as a JSON-compatible list, in the order they are applied."""
+    return (
+        [{"op": "delete", "id": worklog["tempoWorklogId"]} for worklog in worklogs_to_delete]
+        + [{"op": "update", "id": worklog["tempoWorklogId"], "entry": entry_to_record(entry)} for worklog, entry in worklogs_to_update]
+        + [{"op": "add", "entry": entry_to_record(entry)} for entry in worklogs_to_add]
+    )
+
+def update_from_records(date, operations, skip=()):
+    """
+    Rebuilds a (date, worklogs_to_delete, worklogs_to_update, worklogs_to_add) update from serialized
+    operations, leaving out the ones whose index is in skip.
+    """
+    worklogs_to_delete, worklogs_to_update, worklogs_to_add = [], [], []
+    for index, operation in enumerate(operations):
+        if index in skip:
+            continue
+        if operation["op"] == "delete":
+            worklogs_to_delete.append({"tempoWorklogId": operation["id"]})
+        elif operation["op"] == "update":
+            worklogs_to_update.append(({"tempoWorklogId": operation["id"]}, entry_from_record(date, operation["entry"])))
+        else:
+            worklogs_to_add.append(entry_from_record(date, operation["entry"]))
+    return date, worklogs_to_delete, worklogs_to_update, worklogs_to_add
+
+class Journal:
+    """
+    Append-only log of the writes planned and completed for each day, one JSON record per line.
+
+    Before a day is written its full list of operations is recorded as a "plan"; every finished
+    operation is recorded as "done", and a fully applied day as "complete" together with the
+    hash of its content. Days applied before with the same content can then be skipped without
+    asking the server, and a run interrupted half-way through a day can be resumed without
+    asking for confirmation again.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        # (worker, date) -> hash of the last successfully applied content
+        self.completed = {}
+        # (worker, date) -> [hash, operations, set of indexes of done operations]
+        self.pending = {}
+        self._load()
+
+    def _load(self):
+        record_count = 0
+        try:
+            with open(self.path, "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # A record torn by a crash while it was being written
+                    record_count += 1
+                    self._replay(record)
+        except FileNotFoundError:
+            pass
+
+        if record_count > len(self.completed) + len(self.pending) + COMPACT_THRESHOLD:
+            self._compact()
+
+    def _replay(self, record):
+        key = (record["worker"], record["date"])
+        if record["type"] == "plan":
+            self.pending[key] = [record["hash"], record["operations"], set()]
+        elif record["type"] == "done":
+            if key in self.pending:
+                self.pending[key][2].add(record["index"])
+        elif record["type"] == "complete":
+            self.pending.pop(key, None)
+            self.completed[key] = record["hash"]
+
+    def _compact(self):
+        """Rewrites the journal keeping only the records still needed."""
+        records = [
+            {"type": "complete", "worker": worker, "date": date, "hash": content_hash}
+            for (worker, date), content_hash in self.completed.items()
+        ]
+        for (worker, date), (content_hash, operations, done) in self.pending.items():
+            records.append({"type": "plan", "worker": worker, "date": date, "hash": content_hash, "operations": operations})
+            records.extend({"type": "done", "worker": worker, "date": date, "index": index} for index in sorted(done))
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            f.writelines(json.dumps(record) + "\n" for record in records)
+        os.replace(temp_path, self.path)
+
+    def _append(self, record):
+        record["time"] = time.time()
+        with self.lock:
+            self._replay(record)
+            with open(self.path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def completed_hash(self, worker, date):
+        return self.completed.get((worker, date))
+
+    def confirmed_worklog_ids(self, worker, date, content_hash):
+        """
+        Returns the IDs of the existing worklogs that an interrupted apply of the day, with the same
+        content, was confirmed to delete or update, or None if no such apply was interrupted.
+        """
+        pending = self.pending.get((worker, date))
+        if not pending or pending[0] != content_hash:
+            return None
+        _, operations, _ = pending
+        return {operation["id"] for operation in operations if operation["op"] in ("delete", "update")}
+
+    def record_plan(self, worker, date, content_hash, worklogs_to_delete, worklogs_to_update, worklogs_to_add):
+        """Records the operations about to be applied to a day. They are numbered in the order given."""
+        operations = operations_to_records(worklogs_to_delete, worklogs_to_update, worklogs_to_add)
+        self._append({"type": "plan", "worker": worker, "date": date, "hash": content_hash, "operations": operations})
+
+    def record_done(self, worker, date, index):
+        self._append({"type": "done", "worker": worker, "date": date, "index": index})
+
+    def record_complete(self, worker, date, content_hash):
+        self._append({"type": "complete", "worker": worker, "date": date, "hash": content_hash})
+
+def open_journal():
+    """Opens the journal of the configured JIRA instance and user, or returns None if it is disabled."""
+    settings = config.journal
+    if not settings["enabled"]:
+        return None
+    os.makedirs(settings["dir"], exist_ok=True)
+    return Journal(os.path.join(settings["dir"], f"{instance_key()}.journal"))
@@ -0,0 +1,110 @@
+import contextlib
+import json
+import math
+import re
+import threading
+import time
+
+# Set by --metrics; nothing is recorded otherwise
+ENABLED = False
+
+# Trailing resource IDs are collapsed, so that e.g. every worklog ID counts as one endpoint
+_ID_SEGMENT = re.compile(r"/\d+$")
+
+_requests = []
+_phases = {}
+_lock = threading.Lock()
+
+def endpoint_name(method, path):
+    """Returns the endpoint a request belongs to, e.g. 'DELETE /rest/tempo-timesheets/4/worklogs/{id}'."""
+    return f"{method} {_ID_SEGMENT.sub('/{id}', path.split('?', 1)[0])}"
+
+def record_request(method, path, status, seconds, retries):
+    """Records one API call. status is the final HTTP status, or the name of the exception that ended it."""
+    if not ENABLED:
+        return
+    with _lock:
+        _requests.append({
+            "endpoint": endpoint_name(method, path),
+            "status": status,
+            "seconds": seconds,
+            "retries": retries,
+        })
+
+@contextlib.contextmanager
+def phase(name):
+    """
+    Adds the time spent in the block to the named phase. Phases may nest and repeat.
+    Also usable as a function decorator.
+    """
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with _lock:
+            total, count = _phases.get(name, (0.0, 0))
+            _phases[name] = (total + elapsed, count + 1)
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+def summarize_requests(requests):
+    latencies = sorted(request["seconds"] for request in requests)
+    statuses = {}
+    for request in requests:
+        statuses[str(request["status"])] = statuses.get(str(request["status"]), 0) + 1
+    return {
+        "count": len(requests),
+        "retries": sum(request["retries"] for request in requests),
+        "total_seconds": sum(latencies),
+        "p50_seconds": percentile(latencies, 0.5),
+        "p95_seconds": percentile(latencies, 0.95),
+        "statuses": statuses,
+    }
+
+def summary():
+    """Returns the recorded metrics: totals over all requests, per endpoint and per phase."""
+    with _lock:
+        requests = list(_requests)
+        phases = dict(_phases)
+    by_endpoint = {}
+    for request in requests:
+        by_endpoint.setdefault(request["endpoint"], []).append(request)
+    return {
+        "requests": summarize_requests(requests),
+        "endpoints": {endpoint: summarize_requests(by_endpoint[endpoint]) for endpoint in sorted(by_endpoint)},
+        "phases": {name: {"seconds": total, "count": count} for name, (total, count) in sorted(phases.items())},
+        "calls": requests,
+    }
+
+def print_summary(data):
+    requests = data["requests"]
+    print(
+        f"Metrics: {requests['count']} request(s), {requests['retries']} retries, "
+        f"{requests['total_seconds']:.3f}s total, p50 {requests['p50_seconds'] * 1000:.1f}ms, p95 {requests['p95_seconds'] * 1000:.1f}ms"
+    )
+    for endpoint, stats in data["endpoints"].items():
+        statuses = ", ".join(f"{status}: {count}" for status, count in sorted(stats["statuses"].items()))
+        print(
+            f"  {endpoint}: {stats['count']} request(s), {stats['retries']} retries, {stats['total_seconds']:.3f}s total, "
+            f"p50 {stats['p50_seconds'] * 1000:.1f}ms, p95 {stats['p95_seconds'] * 1000:.1f}ms ({statuses})"
+        )
+    for name, stats in data["phases"].items():
+        print(f"  phase {name}: {stats['seconds']:.3f}s ({stats['count']}x)")
+
+def report(json_path=None):
+    """Prints the summary of the recorded metrics and, if json_path is given, writes it there as JSON."""
+    data = summary()
+    print_summary(data)
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(data, f, indent=2)
+        print(f"Metrics written to {json_path}")
@@ -0,0 +1,174 @@
+import datetime
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from . import cache
+from .cache import instance_key
+from .config import config
+from .parser import existing_worklog_entry
+from .tempo import search_worklogs
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS worklogs (
+    id INTEGER PRIMARY KEY,
+    worker TEXT NOT NULL,
+    date TEXT NOT NULL,
+    ticket TEXT NOT NULL,
+    account TEXT NOT NULL,
+    component TEXT NOT NULL,
+    seconds INTEGER NOT NULL,
+    updated TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS worklogs_worker_date ON worklogs (worker, date);
+CREATE INDEX IF NOT EXISTS worklogs_ticket ON worklogs (ticket);
+CREATE INDEX IF NOT EXISTS worklogs_account ON worklogs (account);
+CREATE TABLE IF NOT EXISTS synced_days (
+    worker TEXT NOT NULL,
+    date TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    checked_at REAL NOT NULL,
+    PRIMARY KEY (worker, date)
+);
+"""
+
+def days_between(start_date, end_date):
+    day = datetime.date.fromisoformat(start_date)
+    end = datetime.date.fromisoformat(end_date)
+    while day <= end:
+        yield day.isoformat()
+        day += datetime.timedelta(days=1)
+
+class Mirror:
+    """
+    Local SQLite copy of the worklogs of one JIRA instance, indexed by date, ticket and account.
+
+    A date range is fetched in full the first time it is needed and whenever its full sync is older
+    than the cache TTL (or --refresh is given). After that, only the worklogs created or changed
+    since the previous sync are asked for, using the search's updatedFrom filter, and stored over
+    the mirrored ones. Worklogs deleted outside autotempo only disappear from the mirror with the
+    next full sync, so days about to be written are fetched again with refresh() first.
+    Writes made by autotempo are recorded as they happen.
+
+    The connection is shared by the threads of apply --jobs and guarded by a lock.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def _store(self, worklogs):
+        """Inserts or replaces (worker, worklog) pairs. Must be called with the lock held, inside a transaction."""
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO worklogs (id, worker, date, ticket, account, component, seconds, updated, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (worklog['tempoWorklogId'], worker, entry.date, entry.ticket, entry.account, entry.component, entry.seconds, worklog.get('dateUpdated'), json.dumps(worklog))
+                for worker, worklog, entry in ((worker, worklog, existing_worklog_entry(worklog)) for worker, worklog in worklogs)
+            ]
+        )
+
+    def _replace_days(self, worker, start_date, end_date, now):
+        """Fetches all worklogs of worker between the two dates and replaces the mirrored ones. Returns the (worker, worklog) pairs fetched."""
+        worklogs = list(search_worklogs(start_date, end_date, [worker]))
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM worklogs WHERE worker = ? AND date BETWEEN ? AND ?", (worker, start_date, end_date))
+            self._store(worklogs)
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO synced_days (worker, date, synced_at, checked_at) VALUES (?, ?, ?, ?)",
+                [(worker, date, now, now) for date in days_between(start_date, end_date)]
+            )
+        return worklogs
+
+    def sync(self, worker, start_date, end_date):
+        """
+        Brings the mirrored worklogs of worker between the two dates (inclusive) up to date with the server.
+        Returns the days that were fetched in full from the server.
+        """
+        now = time.time()
+        with self.lock:
+            # Days whose last full sync is still within the TTL, with the time they were last checked
+            checked_at = dict(self.connection.execute(
+                "SELECT date, checked_at FROM synced_days WHERE worker = ? AND date BETWEEN ? AND ? AND synced_at >= ?",
+                (worker, start_date, end_date, now - config.cache["ttl"])
+            ))
+        days = list(days_between(start_date, end_date))
+
+        missing_days = days if cache.REFRESH_CACHE else [date for date in days if date not in checked_at]
+        if missing_days:
+            self._replace_days(worker, missing_days[0], missing_days[-1], now)
+
+        # The other days only need the worklogs changed since they were last checked
+        known_days = [date for date in days if date in checked_at and not (missing_days and missing_days[0] <= date <= missing_days[-1])]
+        if known_days:
+            # updatedFrom has a granularity of days; start a day early to be safe across time zones
+            oldest_check = datetime.date.fromtimestamp(min(checked_at[date] for date in known_days))
+            updated_from = (oldest_check - datetime.timedelta(days=1)).isoformat()
+            changed_worklogs = list(search_worklogs(known_days[0], known_days[-1], [worker], updated_from))
+            with self.lock, self.connection:
+                self._store(changed_worklogs)
+                self.connection.executemany(
+                    "UPDATE synced_days SET checked_at = ? WHERE worker = ? AND date = ?",
+                    [(now, worker, date) for date in known_days]
+                )
+        return missing_days
+
+    def refresh(self, worker, start_date, end_date):
+        """
+        Fetches the worklogs of worker between the two dates (inclusive) from the server in one search,
+        replacing the mirrored ones, including any deleted in Tempo since. Returns them by date.
+        """
+        worklogs_by_date = {}
+        for _, worklog in self._replace_days(worker, start_date, end_date, time.time()):
+            worklogs_by_date.setdefault(worklog['started'][:10], []).append(worklog)
+        return worklogs_by_date
+
+    def get_existing_worklogs(self, start_date, end_date, worker, sync=True):
+        """Like tempo.get_existing_worklogs, but synced incrementally (unless sync is False) and read from the mirror."""
+        worklogs_by_date = {}
+        for worklog in self.iter_worklogs(start_date, end_date, worker, sync):
+            worklogs_by_date.setdefault(worklog['started'][:10], []).append(worklog)
+        return worklogs_by_date
+
+    def iter_worklogs(self, start_date, end_date, worker, sync=True, batch_size=1000):
+        """Syncs the range (unless sync is False), then yields its mirrored worklogs in date order, reading batch_size rows at a time."""
+        if sync:
+            self.sync(worker, start_date, end_date)
+        with self.lock:
+            cursor = self.connection.execute(
+                "SELECT data FROM worklogs WHERE worker = ? AND date BETWEEN ? AND ? ORDER BY date, id",
+                (worker, start_date, end_date)
+            )
+        while True:
+            with self.lock:
+                rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for data, in rows:
+                yield json.loads(data)
+
+    def record_saved(self, worker, worklog):
+        """Records a worklog added or updated by autotempo."""
+        with self.lock, self.connection:
+            self._store([(worklog.get('worker', worker), worklog)])
+
+    def record_deleted(self, worklog_id):
+        """Records a worklog deleted by autotempo."""
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM worklogs WHERE id = ?", (worklog_id,))
+
+def open_mirror():
+    """Returns the worklog mirror of the configured JIRA instance, or None if it is disabled."""
+    settings = config.mirror
+    if not settings["enabled"]:
+        return None
+    path = settings["path"] or os.path.join(config.cache["dir"], f"{instance_key()}.sqlite3")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    return Mirror(path)
@@ -0,0 +1,166 @@
+import datetime
+import math
+
+from .config import config
+
+class WorklogEntry:
+    """A single worklog. Durations are kept in whole seconds, so sums and comparisons are exact."""
+    __slots__ = ("date", "seconds", "ticket", "account", "component", "comment", "is_overtime", "line_number")
+
+    def __init__(self, date, seconds, ticket, account, component, comment="", is_overtime=False, line_number=None):
+        self.date = date
+        self.seconds = seconds
+        self.ticket = ticket
+        self.account = account
+        self.component = component
+        self.comment = comment
+        self.is_overtime = is_overtime
+        self.line_number = line_number
+
+    @property
+    def hours(self):
+        return self.seconds / 3600
+
+    def key(self):
+        """Returns the (ticket, seconds, account, component, comment) key worklogs are compared by."""
+        return (self.ticket, self.seconds, self.account, self.component, self.comment)
+
+    def __repr__(self):
+        return repr((self.ticket, self.hours, self.account, self.component, self.comment))
+
+# Fields of the records read and written by import and export
+RECORD_FIELDS = ("date", "hours", "ticket", "account", "component", "comment")
+
+def existing_worklog_entry(worklog):
+    """Converts a worklog fetched from Tempo to a WorklogEntry."""
+    ticket = worklog['issue']['key']
+    return WorklogEntry(
+        worklog['started'][:10],
+        worklog['timeSpentSeconds'],
+        ticket,
+        worklog['attributes']['_Initiative_']['value'],
+        worklog['attributes']['_Componenttool_']['value'],
+        # Tempo fills in a default comment when none is given
+        "" if worklog['comment'] == f"Working on issue {ticket}" else worklog['comment']
+    )
+
+class WorklogParser:
+    """
+    Parses .jira worklog files in a single streaming pass.
+
+    The keyword and project sections of the configuration are compiled once into lookup
+    tables, so resolving a line costs a single dict lookup. Errors do not stop parsing;
+    they are collected with their line numbers in `errors`.
+    """
+    def __init__(self):
+        self.keywords = {
+            name.lower(): (keyword["ticket"], keyword["account"], keyword["component"])
+            for name, keyword in config.keywords.items()
+        }
+        self.projects = {
+            name: (project["account"], project["component"])
+            for name, project in config.projects.items()
+        }
+        self.valid_dates = set()
+        self.errors = []
+
+    def check_date(self, date):
+        """Raises ValueError unless date is a YYYY-MM-DD date."""
+        if date not in self.valid_dates:
+            try:
+                datetime.datetime.strptime(date, "%Y-%m-%d")
+            except ValueError:
+                raise ValueError(f"Invalid date '{date}', expected YYYY-MM-DD")
+            self.valid_dates.add(date)
+
+    def parse_hours(self, hours_str):
+        """Parses hours into (seconds, is_overtime); a leading + marks overtime. Raises ValueError if invalid."""
+        try:
+            hours = float(hours_str)
+        except ValueError:
+            raise ValueError(f"Invalid hours '{hours_str}'")
+        # float() also accepts inf and nan, which are no durations
+        if not math.isfinite(hours):
+            raise ValueError(f"Invalid hours '{hours_str}'")
+        seconds = int(round(hours * 3600))
+        return seconds, hours_str.startswith('+')
+
+    def resolve(self, ticket_or_keyword):
+        """Returns the (ticket, account, component) of a project issue key or keyword, or None if it is neither."""
+        project = self.projects.get(ticket_or_keyword.split('-', 1)[0]) if '-' in ticket_or_keyword else None
+        if project:
+            return (ticket_or_keyword, *project)
+        return self.keywords.get(ticket_or_keyword.lower())
+
+    def parse_line(self, line, line_number=None):
+        """Parses one worklog line into a WorklogEntry. Raises ValueError if the line is invalid."""
+        parts = line.split()
+        if len(parts) < 3:
+            raise ValueError(f"Invalid entry: {line}")
+
+        date, hours_str, ticket_or_keyword = parts[0], parts[1], parts[2]
+        self.check_date(date)
+        seconds, is_overtime = self.parse_hours(hours_str)
+
+        resolved = self.resolve(ticket_or_keyword)
+        if not resolved:
+            raise ValueError(f"Unknown project or keyword in entry: {line}.")
+        ticket, account, component = resolved
+
+        # Parse comment and overrides
+        comment_parts = []
+        for part in parts[3:]:
+            if part.startswith("account:"):
+                account = part[len("account:"):]
+            elif part.startswith("component:"):
+                component = part[len("component:"):]
+            else:
+                comment_parts.append(part)
+        comment = " ".join(comment_parts).strip('"')
+
+        return WorklogEntry(date, seconds, ticket, account, component, comment, is_overtime, line_number)
+
+    def parse_record(self, record, line_number=None):
+        """
+        Parses an imported record, a dict with the RECORD_FIELDS, into a WorklogEntry. The ticket is
+        resolved like in a .jira line, and a non-empty account or component overrides the resolved one;
+        an issue of a project missing from the configuration needs both. Raises ValueError if the record is invalid.
+        """
+        date = str(record.get("date") or "").strip()
+        hours = record.get("hours")
+        hours_str = "" if hours is None else str(hours).strip()
+        ticket_or_keyword = str(record.get("ticket") or "").strip()
+        if not (date and hours_str and ticket_or_keyword):
+            raise ValueError("Missing date, hours or ticket")
+        self.check_date(date)
+        seconds, is_overtime = self.parse_hours(hours_str)
+
+        account = str(record.get("account") or "").strip()
+        component = str(record.get("component") or "").strip()
+        resolved = self.resolve(ticket_or_keyword)
+        if resolved:
+            ticket, default_account, default_component = resolved
+            account = account or default_account
+            component = component or default_component
+        elif account and component and '-' in ticket_or_keyword:
+            ticket = ticket_or_keyword
+        else:
+            raise ValueError(f"Unknown project or keyword '{ticket_or_keyword}'")
+
+        comment = str(record.get("comment") or "")
+        return WorklogEntry(date, seconds, ticket, account, component, comment, is_overtime, line_number)
+
+    def parse(self, lines):
+        """Yields a WorklogEntry for every valid line, skipping empty lines and comments."""
+        for line_number, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                yield self.parse_line(line, line_number)
+            except ValueError as e:
+                self.errors.append((line_number, str(e)))
+
+    def parse_file(self, file_path):
+        with open(file_path, "r") as f:
+            yield from self.parse(f)
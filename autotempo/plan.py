@@ -0,0 +1,103 @@
+import datetime
+import json
+
+from .config import config
+from .errors import FatalError
+from .journal import day_hash, open_journal, operations_to_records, update_from_records
+from .mirror import open_mirror
+from .tempo import get_worker
+from .worklogs import apply_day_updates, existing_worklog_entry, expand_file_patterns, get_existing_worklogs_for_dates, plan_day_updates, read_valid_worklogs
+
+PLAN_VERSION = 1
+
+def worklog_fingerprints(worklogs):
+    """Returns a comparable summary of a day's worklogs on the server, used to detect drift."""
+    return sorted([worklog['tempoWorklogId'], *existing_worklog_entry(worklog).key()] for worklog in worklogs)
+
+def create_plan(file_paths, plan_path=None):
+    """
+    Fetches everything needed in bulk, computes the changes of every day of one or more worklog
+    files (names or glob patterns) and writes them to a JSON plan file, without asking anything and
+    without writing to the server. The plan file is named after a single file by default; several
+    files or a pattern need plan_path.
+    Returns the path of the plan file, or None if the worklog files are invalid.
+    """
+    patterns = [file_paths] if isinstance(file_paths, str) else list(file_paths)
+    file_paths = expand_file_patterns(patterns)
+    if plan_path is None:
+        if len(file_paths) != 1 or file_paths != patterns:
+            raise FatalError("Planning several files or a glob pattern needs the path of the plan file (--output).")
+        plan_path = f"{file_paths[0]}.plan.json"
+
+    try:
+        parsed = read_valid_worklogs(file_paths)
+    except ValueError as e:
+        print(f"Validation error: {e}")
+        return None
+    if parsed is None:
+        return None
+    dates_processed, valid_dates = parsed
+
+    existing_worklogs_by_date = get_existing_worklogs_for_dates(valid_dates)
+
+    days = []
+    for date, worklogs_to_delete, worklogs_to_update, worklogs_to_add in plan_day_updates(valid_dates, dates_processed, existing_worklogs_by_date, confirm=False):
+        if not (worklogs_to_delete or worklogs_to_update or worklogs_to_add):
+            continue
+        days.append({
+            "date": date,
+            "hash": day_hash(dates_processed[date]),
+            "existing": worklog_fingerprints(existing_worklogs_by_date.get(date, [])),
+            "operations": operations_to_records(worklogs_to_delete, worklogs_to_update, worklogs_to_add),
+        })
+
+    plan = {
+        "version": PLAN_VERSION,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "jira_url": config.jira_url,
+        "worker": get_worker(),
+        "source": " ".join(file_paths),
+        "days": days,
+    }
+    with open(plan_path, "w") as f:
+        json.dump(plan, f, indent=2)
+    operation_count = sum(len(day["operations"]) for day in days)
+    print(f"Plan with {operation_count} operation(s) on {len(days)} day(s) written to {plan_path}")
+    return plan_path
+
+def apply_plan(plan_path, jobs=1):
+    """
+    Applies a plan file without asking anything. The existing worklogs of all planned days are fetched
+    first, in one search per range of nearby days, and the plan is refused if any of them changed since it was made.
+    """
+    try:
+        with open(plan_path, "r") as f:
+            plan = json.load(f)
+    except (OSError, ValueError) as e:
+        raise FatalError(f"Cannot read plan file {plan_path}", e)
+
+    if plan.get("version") != PLAN_VERSION:
+        raise FatalError(f"Unsupported plan file version {plan.get('version')} in {plan_path}")
+    if plan["jira_url"] != config.jira_url or plan["worker"] != get_worker():
+        raise FatalError(f"Plan {plan_path} was made for {plan['worker']} on {plan['jira_url']}, not for the configured user.")
+
+    days = plan["days"]
+    if not days:
+        print("The plan contains no changes.")
+        return
+
+    dates = [day["date"] for day in days]
+    existing_worklogs_by_date = get_existing_worklogs_for_dates(dates)
+    drifted_dates = [
+        day["date"] for day in days
+        if worklog_fingerprints(existing_worklogs_by_date.get(day["date"], [])) != day["existing"]
+    ]
+    if drifted_dates:
+        raise FatalError(
+            f"Worklogs on the server changed since the plan was made, on {', '.join(drifted_dates)}. "
+            f"Create a new plan with: plan {plan['source']}"
+        )
+
+    updates = [update_from_records(day["date"], day["operations"]) for day in days]
+    day_hashes = {day["date"]: day["hash"] for day in days}
+    apply_day_updates(updates, jobs, journal=open_journal(), day_hashes=day_hashes, mirror=open_mirror())
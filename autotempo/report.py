@@ -0,0 +1,109 @@
+import contextlib
+import csv
+import datetime
+import sys
+
+from . import metrics
+from .errors import FatalError
+from .template import format_hours
+from .mirror import open_mirror
+from .tempo import get_worker, search_worklogs
+from .worklogs import existing_worklog_entry
+
+# Fields worklogs can be grouped by, and how to read them from a WorklogEntry
+GROUP_FIELDS = {
+    "ticket": lambda entry: entry.ticket,
+    "account": lambda entry: entry.account,
+    "component": lambda entry: entry.component,
+    "day": lambda entry: entry.date,
+    "month": lambda entry: entry.date[:7],
+}
+
+def parse_group_by(group_by):
+    """Parses a comma separated list of GROUP_FIELDS. Raises ValueError on unknown fields."""
+    fields = [field.strip() for field in group_by.split(",") if field.strip()]
+    unknown = [field for field in fields if field not in GROUP_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown group-by field(s): {', '.join(unknown)}. Expected some of: {', '.join(GROUP_FIELDS)}")
+    if not fields:
+        raise ValueError("At least one group-by field is required")
+    return fields
+
+def aggregate_worklogs(worklogs, fields):
+    """
+    Sums up the time of a stream of Tempo worklogs per group, keeping only the running totals.
+    Returns a dict mapping each group (a tuple of the field values) to [seconds, number of worklogs].
+    """
+    readers = [GROUP_FIELDS[field] for field in fields]
+    totals = {}
+    for worklog in worklogs:
+        entry = existing_worklog_entry(worklog)
+        group = tuple(read(entry) for read in readers)
+        total = totals.get(group)
+        if total is None:
+            totals[group] = [entry.seconds, 1]
+        else:
+            total[0] += entry.seconds
+            total[1] += 1
+    return totals
+
+def write_table(totals, fields, out):
+    rows = [(*group, format_hours(seconds), str(count)) for group, (seconds, count) in sorted(totals.items())]
+    total_seconds = sum(seconds for seconds, _ in totals.values())
+    total_count = sum(count for _, count in totals.values())
+    header = (*fields, "hours", "worklogs")
+    footer = ("total", *[""] * (len(fields) - 1), format_hours(total_seconds), str(total_count))
+    widths = [max(len(row[column]) for row in [header, footer, *rows]) for column in range(len(header))]
+
+    def line(row):
+        # Text columns are left aligned, the numbers right aligned
+        cells = [value.ljust(width) for value, width in zip(row[:len(fields)], widths)]
+        cells += [value.rjust(width) for value, width in zip(row[len(fields):], widths[len(fields):])]
+        return "  ".join(cells).rstrip()
+
+    out.write(line(header) + "\n")
+    out.write("  ".join("-" * width for width in widths) + "\n")
+    for row in rows:
+        out.write(line(row) + "\n")
+    out.write("  ".join("-" * width for width in widths) + "\n")
+    out.write(line(footer) + "\n")
+
+def write_csv(totals, fields, out):
+    writer = csv.writer(out)
+    writer.writerow([*fields, "hours", "worklogs"])
+    for group, (seconds, count) in sorted(totals.items()):
+        writer.writerow([*group, format_hours(seconds), count])
+
+@metrics.phase("report")
+def report_worklogs(start_date, end_date, group_by="ticket", output_format="table", output_path=None):
+    """
+    Prints the time logged by the current user between start_date and end_date (inclusive),
+    grouped by the comma separated group_by fields, as a table or as CSV.
+    Worklogs are streamed from the search one chunk at a time and only the totals are kept.
+    """
+    try:
+        fields = parse_group_by(group_by)
+        datetime.datetime.strptime(start_date, "%Y-%m-%d")
+        datetime.datetime.strptime(end_date, "%Y-%m-%d")
+    except ValueError as e:
+        raise FatalError(str(e))
+    if start_date > end_date:
+        raise FatalError(f"The start date {start_date} is after the end date {end_date}.")
+
+    # Keep stdout for the report itself, so that it can be redirected to a file
+    with contextlib.redirect_stdout(sys.stderr):
+        worker = get_worker()
+    mirror = open_mirror()
+    if mirror:
+        worklogs = mirror.iter_worklogs(start_date, end_date, worker)
+    else:
+        worklogs = (worklog for _, worklog in search_worklogs(start_date, end_date, [worker]))
+    totals = aggregate_worklogs(worklogs, fields)
+
+    write = write_csv if output_format == "csv" else write_table
+    if output_path:
+        with open(output_path, "w", newline="") as f:
+            write(totals, fields, f)
+        print(f"Report written to {output_path}")
+    else:
+        write(totals, fields, sys.stdout)
@@ -0,0 +1,103 @@
+import os
+
+from .config import config
+from .errors import FatalError
+from .tempo import get_existing_worklogs_for_workers, get_working_days_for_workers
+from .journal import day_hash, open_journal
+from .mirror import open_mirror
+from .worklogs import apply_day_updates, check_worklog_references, plan_day_updates, read_worklog_file, resume_from_journal, validate_worklogs
+
+def find_team_files(directory):
+    """
+    Returns (worker, file path) pairs for the .jira files in directory, sorted by worker.
+    A file is named after the JIRA user key of its owner, or after a name mapped to
+    the user key in the optional [team] section of config.toml.
+    """
+    team = config.get("team", {})
+    team_files = []
+    for file_name in sorted(os.listdir(directory)):
+        name, extension = os.path.splitext(file_name)
+        if extension != ".jira":
+            continue
+        team_files.append((team.get(name, name), os.path.join(directory, file_name)))
+    return sorted(team_files)
+
+def process_team_directory(directory, jobs=1, validate_only=False):
+    """
+    Validates and applies the worklog files of a whole team. Calendars and existing worklogs
+    of all users are fetched together in batched requests, then each user is applied in turn.
+    Returns True if every file was valid (and, unless validate_only, applied).
+    """
+    team_files = find_team_files(directory)
+    if not team_files:
+        print(f"No .jira files found in {directory}.")
+        return False
+
+    failed_workers = []
+    parsed = {}
+    for worker, file_path in team_files:
+        result = read_worklog_file(file_path)
+        if result is None:
+            print(f"{worker}: could not parse {file_path}.")
+            failed_workers.append(worker)
+        else:
+            parsed[worker] = result
+
+    # Check the issues of everybody in one batched search, and all accounts and components locally
+    team_file_paths = dict(team_files)
+    if parsed and not check_worklog_references(
+        (team_file_paths[worker], entries) for worker, (dates_processed, _) in parsed.items() for entries in dates_processed.values()
+    ):
+        raise FatalError("Some worklog files name JIRA issues, accounts or components that do not exist. Nothing was applied.")
+
+    # Fetch the calendars of everybody at once
+    all_dates = [date for dates_processed, _ in parsed.values() for date in dates_processed]
+    if all_dates:
+        working_days = get_working_days_for_workers(min(all_dates), max(all_dates), list(parsed))
+    else:
+        working_days = {}
+
+    valid_dates = {}
+    for worker, (dates_processed, daily_seconds) in parsed.items():
+        try:
+            valid_dates[worker] = validate_worklogs(list(dates_processed), daily_seconds, working_days.get(worker, set()))
+        except ValueError as e:
+            print(f"{worker}: Validation error: {e}")
+            failed_workers.append(worker)
+
+    if validate_only:
+        if not failed_workers:
+            print(f"Worklogs of all {len(valid_dates)} users are valid.")
+        return not failed_workers
+
+    # Days unchanged since the last apply need no server round trip
+    journal = open_journal()
+    mirror = open_mirror()
+    day_hashes = {}
+    dates_to_compare = {}
+    confirmed_ids = {}
+    for worker, dates in valid_dates.items():
+        day_hashes[worker] = {date: day_hash(parsed[worker][0][date]) for date in dates}
+        print(f"Checking worklogs of {worker}:")
+        dates_to_compare[worker], confirmed_ids[worker] = resume_from_journal(journal, worker, dates, day_hashes[worker])
+
+    # Fetch the existing worklogs of all users at once
+    all_dates_to_compare = [date for dates in dates_to_compare.values() for date in dates]
+    if all_dates_to_compare:
+        workers_to_compare = [worker for worker, dates in dates_to_compare.items() if dates]
+        existing_worklogs = get_existing_worklogs_for_workers(min(all_dates_to_compare), max(all_dates_to_compare), workers_to_compare)
+    else:
+        existing_worklogs = {}
+
+    for worker in valid_dates:
+        print(f"Applying worklogs of {worker}:")
+        updates = plan_day_updates(dates_to_compare[worker], parsed[worker][0], existing_worklogs.get(worker, {}), confirmed_ids=confirmed_ids[worker])
+        try:
+            apply_day_updates(updates, jobs, worker, journal, day_hashes[worker], mirror)
+        except FatalError as e:
+            print(f"{worker}: {e}")
+            failed_workers.append(worker)
+
+    if failed_workers:
+        raise FatalError(f"Worklogs of {len(failed_workers)} user(s) were not applied: {', '.join(sorted(failed_workers))}")
+    return True
@@ -0,0 +1,156 @@
+import datetime
+
+from .config import config
+from .errors import FatalError
+from .dates import month_bounds, months_between
+from .tempo import get_working_days
+from .worklogs import WORKING_DAY_SECONDS
+
+def parse_day_of_week(day_of_week_str):
+    """
+    Parses a day of week string which can contain comma-separated values,
+    ranges, and short names.
+    Returns a set of lowercase full day names.
+    """
+    days_of_week_map = {
+        "mon": "monday", "tue": "tuesday", "wed": "wednesday",
+        "thu": "thursday", "fri": "friday", "sat": "saturday",
+        "sun": "sunday",
+        "monday": "monday", "tuesday": "tuesday", "wednesday": "wednesday",
+        "thursday": "thursday", "friday": "friday", "saturday": "saturday",
+        "sunday": "sunday"
+    }
+    ordered_days = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+    
+    selected_days = set()
+    parts = day_of_week_str.lower().replace(" ", "").split(',')
+    
+    for part in parts:
+        if '-' in part:
+            try:
+                start_day_str, end_day_str = part.split('-', 1)
+                start_day = days_of_week_map.get(start_day_str)
+                end_day = days_of_week_map.get(end_day_str)
+                
+                if start_day and end_day:
+                    start_index = ordered_days.index(start_day)
+                    end_index = ordered_days.index(end_day)
+                    if start_index <= end_index:
+                        for i in range(start_index, end_index + 1):
+                            selected_days.add(ordered_days[i])
+            except ValueError:
+                continue # ignore malformed ranges
+        else:
+            day = days_of_week_map.get(part)
+            if day:
+                selected_days.add(day)
+                
+    return selected_days
+
+# Names of the days of the week, indexed by datetime.weekday()
+WEEKDAY_NAMES = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+def format_hours(seconds):
+    """Formats a duration as hours with as few decimals as needed, e.g. 8.0, 7.5 or 7.75."""
+    hours = f"{seconds / 3600:.4f}".rstrip("0")
+    return hours + "0" if hours.endswith(".") else hours
+
+def compile_automatic_worklogs(automatic_worklogs):
+    """
+    Compiles the [[automatic]] rules into a table indexed by datetime.weekday(), holding
+    the worklog lines of that day and their total non-overtime duration in seconds.
+    """
+    schedule = [([], 0) for _ in WEEKDAY_NAMES]
+    for auto_log in automatic_worklogs:
+        applicable_days = parse_day_of_week(auto_log.get('day_of_week', ''))
+        for worklog_line in auto_log.get('worklogs', []):
+            if not worklog_line:
+                continue
+            seconds = 0
+            try:
+                hours_str = worklog_line.split()[0]
+                if not hours_str.startswith('+'):
+                    seconds = int(round(float(hours_str) * 3600))
+            except (ValueError, IndexError):
+                print(f"Warning: could not parse hours from automatic worklog: '{worklog_line}'. Skipping for hour calculation.")
+            for weekday, day_name in enumerate(WEEKDAY_NAMES):
+                if day_name in applicable_days:
+                    lines, total_seconds = schedule[weekday]
+                    schedule[weekday] = (lines + [worklog_line], total_seconds + seconds)
+
+    for weekday, (lines, total_seconds) in enumerate(schedule):
+        if total_seconds > WORKING_DAY_SECONDS:
+            print(f"Warning: total hours for non-overtime automatic worklogs on {WEEKDAY_NAMES[weekday].capitalize()} exceeds 8 hours.")
+    return schedule
+
+def parse_month_range(months):
+    """
+    Parses a YYYY-MM month or a YYYY-MM..YYYY-MM range of months; a month may omit its leading zero.
+    Returns the list of YYYY-MM months, raising ValueError if the specification is invalid.
+    """
+    first_month, _, last_month = months.partition("..")
+    last_month = last_month or first_month
+    bounds = []
+    for month in (first_month, last_month):
+        try:
+            # Normalized, since the months are compared and sliced as YYYY-MM strings
+            bounds.append(datetime.datetime.strptime(month, "%Y-%m").strftime("%Y-%m"))
+        except ValueError:
+            raise ValueError(f"Invalid month '{month}', expected YYYY-MM or YYYY-MM..YYYY-MM")
+    first_month, last_month = bounds
+    if last_month < first_month:
+        raise ValueError(f"Invalid month range '{months}', the last month is before the first one")
+    return months_between(f"{first_month}-01", f"{last_month}-01")
+
+def render_template(working_days, schedule):
+    """Returns the template content for the given working days, using a compiled automatic worklog schedule."""
+    template_lines = []
+    for day in sorted(working_days):
+        lines, total_auto_seconds = schedule[datetime.date.fromisoformat(day).weekday()]
+
+        if lines:
+            template_lines.extend(f"{day} {worklog_line}" for worklog_line in lines)
+            remaining_seconds = WORKING_DAY_SECONDS - total_auto_seconds
+            if remaining_seconds > 0:
+                template_lines.append(f"{day} {format_hours(remaining_seconds)} jira-ticket \"comment\"")
+        else:
+            template_lines.append(f"{day} 8.0 jira-ticket \"comment\"")
+
+    return (
+        "# date hours jira-ticket [\"comment\"] [account:<account>] [component:<component>]\n"
+        "# or\n"
+        "# date hours <keyword> [\"comment\"] [account:<account>] [component:<component>]\n"
+        "#\n"
+        "# where <keyword> is one of: interview, scrum, training, etc\n"
+        "# See the definitions of keywords in config.toml\n\n"
+        + "\n".join(template_lines)
+    )
+
+def generate_template(months):
+    """
+    Writes a YYYY-MM.jira template for a month, or for every month of a YYYY-MM..YYYY-MM range.
+    The calendar of the whole range is fetched at once.
+    """
+    try:
+        month_list = parse_month_range(months)
+    except ValueError as e:
+        raise FatalError(str(e))
+
+    # Get working days for the whole range
+    start_date = month_bounds(month_list[0])[0]
+    end_date = month_bounds(month_list[-1])[1]
+    working_days = get_working_days(start_date, end_date)
+
+    # Compile automatic worklogs from config once for all months
+    schedule = compile_automatic_worklogs(config.get("automatic", []))
+
+    for month in month_list:
+        template_content = render_template([day for day in working_days if day.startswith(month)], schedule)
+
+        file_name = f"{month}.jira"
+        try:
+            with open(file_name, "x") as f:
+                f.write(template_content)
+            print(f"Template written to {file_name}")
+        except FileExistsError:
+            print(f"File {file_name} already exists. Template not written to avoid overwriting.")
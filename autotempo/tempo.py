@@ -0,0 +1,363 @@
+import datetime
+import re
+
+import requests
+
+from .cache import cache_get, cache_put, save_cache
+from . import metrics
+from .client import api_request
+from .dates import month_bounds, months_between
+from .errors import FatalError
+
+# JIRA key of the current user, resolved on first use by get_worker()
+WORKER = None
+
+def get_worker():
+    """Returns the JIRA key of the current user, looking it up on first use."""
+    global WORKER
+    if WORKER is None:
+        with metrics.phase("user"):
+            worker = get_current_user_worker_id()
+        if not worker:
+            raise FatalError("Could not determine WORKER ID from JIRA.")
+        print(f"Operating as JIRA user: {worker}")
+        WORKER = worker
+    return WORKER
+
+def get_current_user_worker_id():
+    """Fetches the current user's JIRA key (worker ID) using the API token, or returns the cached one."""
+    worker = cache_get("worker")
+    if worker:
+        return worker
+    try:
+        response = api_request("GET", "/rest/api/2/myself")
+        response.raise_for_status()
+        user_info = response.json()
+        worker = user_info.get("key")
+        if worker:
+            cache_put(worker, "worker")
+            save_cache()
+        return worker
+    except requests.exceptions.RequestException as e:
+        raise FatalError("Failed to retrieve current user information from JIRA", e)
+    except KeyError:
+        raise FatalError("Could not find 'key' in JIRA user information response")
+
+# Maximum number of issue keys looked up by a single JIRA search request
+ISSUE_SEARCH_BATCH_SIZE = 100
+
+# A JIRA issue key: the project key, a dash and the issue number, e.g. PROJ-123
+ISSUE_KEY_PATTERN = re.compile(r"[A-Z][A-Z0-9_]*-[0-9]+")
+
+def is_issue_key(key):
+    return ISSUE_KEY_PATTERN.fullmatch(key) is not None
+
+@metrics.phase("issues")
+def find_unknown_issues(keys):
+    """
+    Returns the issue keys among keys that do not exist in JIRA. Keys known to exist are cached;
+    the others are looked up with one JIRA search per ISSUE_SEARCH_BATCH_SIZE keys. Malformed keys
+    are never sent, since they would break the query, and are returned as unknown.
+    """
+    keys = set(keys)
+    unknown_keys = {key for key in keys if not is_issue_key(key)}
+    keys_to_check = sorted(key for key in keys - unknown_keys if not cache_get("issues", key))
+    if not keys_to_check:
+        return unknown_keys
+
+    for i in range(0, len(keys_to_check), ISSUE_SEARCH_BATCH_SIZE):
+        batch = keys_to_check[i:i + ISSUE_SEARCH_BATCH_SIZE]
+        quoted_keys = ", ".join(f'"{key}"' for key in batch)
+        data = {
+            "jql": f"key in ({quoted_keys})",
+            "fields": ["key"],
+            "maxResults": len(batch),
+            # Without this, JIRA rejects the whole query if a single key does not exist
+            "validateQuery": False,
+        }
+        try:
+            # Searching changes nothing, so it is safe to retry
+            response = api_request("POST", "/rest/api/2/search", data)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            raise FatalError("Failed to look up JIRA issues", e)
+
+        found_keys = {issue["key"] for issue in response.json().get("issues", [])}
+        for key in batch:
+            if key in found_keys:
+                cache_put(True, "issues", key)
+            else:
+                unknown_keys.add(key)
+    save_cache()
+    return unknown_keys
+
+# Work attributes holding the account and the component of a worklog
+WORK_ATTRIBUTE_KEYS = ("_Initiative_", "_Componenttool_")
+
+@metrics.phase("attributes")
+def get_work_attribute_values():
+    """
+    Returns a dict mapping each of WORK_ATTRIBUTE_KEYS to the list of values Tempo accepts for it,
+    or to None if any value is accepted (e.g. free text) or the configuration cannot be read.
+    Static lists use their values that were not removed, account attributes the keys of the
+    accounts that are not closed. The result is cached.
+    """
+    values = cache_get("work_attributes")
+    if values is not None:
+        return values
+
+    try:
+        response = api_request("GET", "/rest/tempo-core/1/work-attribute")
+        if response.status_code in (401, 403, 404):
+            print(f"Warning: could not read the Tempo work attributes ({response.status_code}), accounts and components are not checked.")
+            return {key: None for key in WORK_ATTRIBUTE_KEYS}
+        response.raise_for_status()
+        attributes = {attribute.get("key"): attribute for attribute in response.json()}
+
+        values = {}
+        accounts = accounts_readable = None
+        for key in WORK_ATTRIBUTE_KEYS:
+            attribute = attributes.get(key, {})
+            attribute_type = (attribute.get("type") or {}).get("value")
+            if attribute_type == "STATIC_LIST":
+                values[key] = sorted(item["value"] for item in attribute.get("staticListValues", []) if not item.get("removed"))
+            elif attribute_type == "ACCOUNT":
+                if accounts_readable is None:
+                    accounts_response = api_request("GET", "/rest/tempo-accounts/1/account")
+                    accounts_readable = accounts_response.status_code not in (401, 403, 404)
+                    if accounts_readable:
+                        accounts_response.raise_for_status()
+                        accounts = sorted(account["key"] for account in accounts_response.json() if account.get("status") != "CLOSED")
+                    else:
+                        print(f"Warning: could not read the Tempo accounts ({accounts_response.status_code}), accounts are not checked.")
+                values[key] = accounts
+            else:
+                values[key] = None
+    except requests.exceptions.RequestException as e:
+        raise FatalError("Failed to retrieve the Tempo work attribute configuration", e)
+
+    # Like an unreadable configuration, unreadable accounts are asked for again on the next run
+    if accounts_readable is not False:
+        cache_put(values, "work_attributes")
+        save_cache()
+    return values
+
+# Maximum number of users covered by a single calendar or worklog search request
+USER_BATCH_SIZE = 50
+
+def get_working_days(start_date, end_date, worker=None):
+    """Returns the set of working days of a user (default: the current one) between start_date and end_date (inclusive)."""
+    worker = worker or get_worker()
+    return get_working_days_for_workers(start_date, end_date, [worker])[worker]
+
+@metrics.phase("calendar")
+def get_working_days_for_workers(start_date, end_date, workers):
+    """
+    Returns a dict mapping each worker to its set of working days between start_date and end_date (inclusive).
+    Calendars are cached per user and month; whatever is missing from the cache is fetched
+    in one request per USER_BATCH_SIZE users.
+    """
+    try:
+        datetime.datetime.strptime(start_date, "%Y-%m-%d")
+        datetime.datetime.strptime(end_date, "%Y-%m-%d")
+    except ValueError as e:
+        print(f"Invalid date format: {e}")
+        return {worker: set() for worker in workers}
+
+    months = months_between(start_date, end_date)
+    working_days = {worker: set() for worker in workers}
+    missing_months = {}
+    for worker in workers:
+        for month in months:
+            cached_days = cache_get("working_days", worker, month)
+            if cached_days is None:
+                missing_months.setdefault(worker, []).append(month)
+            else:
+                working_days[worker].update(cached_days)
+
+    if missing_months:
+        # Fetch whole months so that every month in the span can be cached
+        first_month = min(worker_months[0] for worker_months in missing_months.values())
+        last_month = max(worker_months[-1] for worker_months in missing_months.values())
+        missing_workers = list(missing_months)
+        for i in range(0, len(missing_workers), USER_BATCH_SIZE):
+            batch = missing_workers[i:i + USER_BATCH_SIZE]
+            fetched_days = fetch_working_days(month_bounds(first_month)[0], month_bounds(last_month)[1], batch)
+            for worker in batch:
+                if worker not in fetched_days:
+                    continue
+                for month in months_between(first_month, last_month):
+                    month_days = sorted(day for day in fetched_days[worker] if day.startswith(month))
+                    cache_put(month_days, "working_days", worker, month)
+                    working_days[worker].update(month_days)
+        save_cache()
+
+    return {
+        worker: {day for day in days if start_date <= day <= end_date}
+        for worker, days in working_days.items()
+    }
+
+def fetch_working_days(start_date, end_date, workers):
+    """Fetches the working days of the given users. Returns a dict mapping each user key to a set of dates."""
+    data = {
+        "from": start_date,
+        "to": end_date,
+        "userKeys": list(workers)
+    }
+
+    try:
+        response = api_request("POST", "/rest/tempo-timesheets/4/private/days/search", data)
+    except requests.exceptions.RequestException as e:
+        raise FatalError("Failed to retrieve working days", e)
+
+    if response.status_code == 200:
+        days_info = response.json()
+        # One schedule per requested user, in request order
+        return {
+            schedule.get('userKey', worker): {day['date'] for day in schedule['days'] if day['type'] == "WORKING_DAY"}
+            for worker, schedule in zip(workers, days_info)
+        }
+    else:
+        raise FatalError(f"Failed to retrieve working days: {response.status_code} {response.text}", response)
+
+# Maximum number of days covered by a single worklog search, and of worklogs asked for per page
+WORKLOG_SEARCH_CHUNK_DAYS = 92
+WORKLOG_SEARCH_PAGE_SIZE = 1000
+
+def get_existing_worklogs(start_date, end_date, worker=None):
+    """
+    Fetches existing worklogs of a user (default: the current one) between start_date and end_date (inclusive).
+    Returns a dict mapping each date to the list of worklogs started on it.
+    """
+    worker = worker or get_worker()
+    return get_existing_worklogs_for_workers(start_date, end_date, [worker])[worker]
+
+@metrics.phase("worklogs")
+def get_existing_worklogs_for_workers(start_date, end_date, workers):
+    """
+    Fetches existing worklogs of the given users between start_date and end_date (inclusive).
+    Returns a dict mapping each worker to a dict mapping dates to the worklogs started on them.
+    """
+    worklogs_by_worker = {worker: {} for worker in workers}
+    for worker, worklog in search_worklogs(start_date, end_date, workers):
+        # 'started' is e.g. "2025-05-02 00:00:00.000", the date is its first 10 characters
+        worklogs_by_worker.setdefault(worker, {}).setdefault(worklog['started'][:10], []).append(worklog)
+    return worklogs_by_worker
+
+def search_worklogs(start_date, end_date, workers, updated_from=None):
+    """
+    Streams the worklogs of the given users between start_date and end_date (inclusive) as (worker, worklog) pairs.
+    The range is searched in chunks of WORKLOG_SEARCH_CHUNK_DAYS days, users in batches of USER_BATCH_SIZE,
+    and every search is read page by page with offset and maxResults until an empty page comes back,
+    so no worklog is lost to a server-side page limit below maxResults. A page bringing no new worklog
+    means the server ignores the offset, and ends the search. Only one chunk is held in memory at a time,
+    and within a chunk worklogs are in date order, so the whole stream is in date order for a single user.
+    With updated_from (YYYY-MM-DD), only worklogs created or changed on or after that day are returned.
+    """
+    range_end = datetime.datetime.strptime(end_date, "%Y-%m-%d")
+    for i in range(0, len(workers), USER_BATCH_SIZE):
+        batch = list(workers[i:i + USER_BATCH_SIZE])
+        chunk_start = datetime.datetime.strptime(start_date, "%Y-%m-%d")
+        while chunk_start <= range_end:
+            chunk_end = min(chunk_start + datetime.timedelta(days=WORKLOG_SEARCH_CHUNK_DAYS - 1), range_end)
+            data = {
+                "from": chunk_start.strftime("%Y-%m-%d"),
+                "to": chunk_end.strftime("%Y-%m-%d"),
+                "includeSubtasks": True,
+                "worker": batch,
+                "offset": 0,
+                "maxResults": WORKLOG_SEARCH_PAGE_SIZE,
+            }
+            if updated_from:
+                data["updatedFrom"] = updated_from
+
+            chunk_worklogs = {}
+            while True:
+                try:
+                    response = api_request("POST", "/rest/tempo-timesheets/4/worklogs/search", data)
+                    response.raise_for_status()
+                except requests.exceptions.RequestException as e:
+                    raise FatalError(f"Failed to retrieve worklogs from {data['from']} to {data['to']}", e)
+
+                page = response.json()
+                # The server may cap pages below maxResults, so only an empty page is the last one
+                new_worklogs = {worklog['tempoWorklogId']: worklog for worklog in page if worklog['tempoWorklogId'] not in chunk_worklogs}
+                if not new_worklogs:
+                    break
+                chunk_worklogs.update(new_worklogs)
+                data["offset"] += len(page)
+
+            # Pages are not guaranteed to be in date order between themselves
+            for worklog in sorted(chunk_worklogs.values(), key=lambda worklog: worklog['started']):
+                yield (worklog.get('worker', batch[0]) if len(batch) > 1 else batch[0]), worklog
+
+            chunk_start = chunk_end + datetime.timedelta(days=1)
+
+def get_existing_worklogs_for_date(date):
+    return get_existing_worklogs(date, date).get(date, [])
+
+def delete_worklogs(worklogs, log=print):
+    for worklog in worklogs:
+        try:
+            delete_response = api_request("DELETE", f"/rest/tempo-timesheets/4/worklogs/{worklog['tempoWorklogId']}")
+        except requests.exceptions.RequestException as e:
+            raise FatalError(f"Failed to delete worklog {worklog['tempoWorklogId']}", e)
+        if delete_response.status_code in [200, 204]:
+            log(f"Deleted worklog {worklog['tempoWorklogId']}.")
+        elif delete_response.status_code == 404:
+            # Already gone, e.g. deleted by an interrupted run that is being resumed
+            log(f"Worklog {worklog['tempoWorklogId']} was already deleted.")
+        else:
+            raise FatalError(f"Failed to delete worklog {worklog['tempoWorklogId']}: {delete_response.status_code} {delete_response.text}", delete_response)
+
+def hours_to_seconds(hours):
+    # Round rather than truncate, int(1.15 * 3600) would give 4139
+    return int(round(hours * 3600))
+
+def worklog_payload(ticket, hours, account, component, date, comment, worker=None):
+    return {
+        "originTaskId": ticket,
+        "timeSpentSeconds": hours_to_seconds(hours),
+        "worker": worker or get_worker(),
+        "comment": comment,
+        "attributes": {
+            "_Initiative_": {
+                "name": "Account",
+                "workAttributeId": 1,
+                "value": account
+            },
+            "_Componenttool_": {
+                "name": "Component/tool",
+                "workAttributeId": 2,
+                "value": component
+            }
+        },
+        "started": date,
+        "remainingEstimate": 0,
+        "includeNonWorkingDays": False
+    }
+
+def add_worklog(ticket, hours, account, component, date, comment="", log=print, worker=None):
+    """Logs work and returns the worklog created by Tempo."""
+    data = worklog_payload(ticket, hours, account, component, date, comment, worker)
+    try:
+        # Adding is not idempotent, a blind retry after a dropped connection could log the work twice
+        response = api_request("POST", "/rest/tempo-timesheets/4/worklogs", data, idempotent=False)
+        response.raise_for_status()
+        log(f"{date} Logged {hours}h to {ticket}, account {account}, component {component}, \"{comment}\".")
+    except requests.exceptions.RequestException as e:
+        raise FatalError(f"Failed to log work for {ticket} on {date}: {e}", e)
+    # Tempo answers with the list of created worklogs
+    created = response.json()
+    return created[0] if isinstance(created, list) else created
+
+def update_worklog(worklog_id, ticket, hours, account, component, date, comment="", log=print, worker=None):
+    """Changes an existing worklog and returns it as updated by Tempo."""
+    data = worklog_payload(ticket, hours, account, component, date, comment, worker)
+    try:
+        response = api_request("PUT", f"/rest/tempo-timesheets/4/worklogs/{worklog_id}", data)
+        response.raise_for_status()
+        log(f"{date} Updated worklog {worklog_id} to {hours}h on {ticket}, account {account}, component {component}, \"{comment}\".")
+    except requests.exceptions.RequestException as e:
+        raise FatalError(f"Failed to update worklog {worklog_id} for {ticket} on {date}: {e}", e)
+    return response.json()
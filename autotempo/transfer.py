@@ -0,0 +1,221 @@
+import contextlib
+import csv
+import datetime
+import itertools
+import json
+import sys
+
+from . import metrics
+from .errors import FatalError
+from .journal import open_journal
+from .mirror import open_mirror
+from .parser import RECORD_FIELDS, WorklogParser, existing_worklog_entry
+from .template import format_hours
+from .tempo import get_worker, get_working_days, search_worklogs
+from .worklogs import WORKING_DAY_SECONDS, apply_worklog_days, check_worklog_references, group_entries, validate_worklogs
+
+def record_format(file_path):
+    """Returns the format of a record file from its extension: csv for .csv files, jsonl otherwise."""
+    return "csv" if file_path.lower().endswith(".csv") else "jsonl"
+
+def day_records(worklogs, is_working_day):
+    """
+    Converts the worklogs of one day to export records with the RECORD_FIELDS. Tempo does not
+    record overtime, so it is inferred for validation on import: everything logged on a non-working
+    day, and on a working day the last worklogs that can be left out while 8 hours remain, are
+    exported with a leading + on their hours.
+    """
+    entries = [existing_worklog_entry(worklog) for worklog in worklogs]
+    if is_working_day:
+        overtime = set()
+        regular_seconds = sum(entry.seconds for entry in entries)
+        for index in reversed(range(len(entries))):
+            if regular_seconds - entries[index].seconds >= WORKING_DAY_SECONDS:
+                regular_seconds -= entries[index].seconds
+                overtime.add(index)
+    else:
+        overtime = set(range(len(entries)))
+    return [
+        {
+            "date": entry.date,
+            "hours": ("+" if index in overtime else "") + format_hours(entry.seconds),
+            "ticket": entry.ticket,
+            "account": entry.account,
+            "component": entry.component,
+            "comment": entry.comment,
+        }
+        for index, entry in enumerate(entries)
+    ]
+
+def worklog_records(worklogs, working_days):
+    """Streams the records of a date-ordered stream of worklogs, holding one day at a time."""
+    for date, day_worklogs in itertools.groupby(worklogs, key=lambda worklog: worklog['started'][:10]):
+        yield from day_records(day_worklogs, date in working_days)
+
+def write_records(records, output_format, out):
+    """Writes a stream of records as JSON lines or CSV, one at a time. Returns the number of records written."""
+    count = 0
+    if output_format == "csv":
+        writer = csv.DictWriter(out, fieldnames=RECORD_FIELDS)
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+            count += 1
+    else:
+        for record in records:
+            # JSON keeps regular hours as numbers, and overtime as a string with its + sign
+            if not record["hours"].startswith("+"):
+                record["hours"] = float(record["hours"])
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+@metrics.phase("export")
+def export_worklogs(start_date, end_date, output_format="jsonl", output_path=None):
+    """
+    Writes the worklogs of the current user between start_date and end_date (inclusive) as JSON lines
+    or CSV, in date order. Worklogs are streamed from the search one chunk at a time and written as
+    they arrive, so any range can be exported with little memory. The output can be read back by import.
+    """
+    try:
+        datetime.datetime.strptime(start_date, "%Y-%m-%d")
+        datetime.datetime.strptime(end_date, "%Y-%m-%d")
+    except ValueError as e:
+        raise FatalError(str(e))
+    if start_date > end_date:
+        raise FatalError(f"The start date {start_date} is after the end date {end_date}.")
+
+    # Keep stdout for the records themselves, so that they can be redirected to a file
+    with contextlib.redirect_stdout(sys.stderr):
+        worker = get_worker()
+        working_days = get_working_days(start_date, end_date, worker)
+    mirror = open_mirror()
+    if mirror:
+        worklogs = mirror.iter_worklogs(start_date, end_date, worker)
+    else:
+        worklogs = (worklog for _, worklog in search_worklogs(start_date, end_date, [worker]))
+    records = worklog_records(worklogs, working_days)
+
+    if output_path:
+        with open(output_path, "w", newline="", encoding="utf-8") as f:
+            count = write_records(records, output_format, f)
+        print(f"Exported {count} worklog(s) to {output_path}")
+    else:
+        write_records(records, output_format, sys.stdout)
+
+def read_record_entries(file_path, parser):
+    """
+    Streams the records of a JSONL or CSV file as WorklogEntry objects, reading one line at a time.
+    Keywords and projects are resolved by parser, and invalid records are collected in parser.errors
+    with their line numbers.
+    """
+    try:
+        f = open(file_path, "r", newline="", encoding="utf-8")
+    except OSError as e:
+        raise FatalError(f"Cannot read {file_path}: {e}")
+    with f:
+        if record_format(file_path) == "csv":
+            reader = csv.DictReader(f)
+            missing_fields = [field for field in ("date", "hours", "ticket") if field not in (reader.fieldnames or [])]
+            if missing_fields:
+                raise FatalError(f"{file_path} has no {', '.join(missing_fields)} column(s); expected a header with {', '.join(RECORD_FIELDS)}.")
+            records = ((reader.line_num, row) for row in reader)
+        else:
+            records = ((line_number, line) for line_number, line in enumerate(f, 1) if line.strip())
+
+        for line_number, record in records:
+            try:
+                if isinstance(record, str):
+                    record = json.loads(record)
+                    if not isinstance(record, dict):
+                        raise ValueError("Expected a JSON object")
+                yield parser.parse_record(record, line_number)
+            except json.JSONDecodeError as e:
+                parser.errors.append((line_number, f"Invalid JSON: {e}"))
+            except ValueError as e:
+                parser.errors.append((line_number, str(e)))
+
+def read_record_batches(file_path, parser):
+    """
+    Yields the records of a file one month at a time, as (entries by date, non-overtime seconds by date),
+    so that only one month is held in memory. The records of a month must be next to each other, as they
+    are in an export; a month found again further down is reported in parser.errors and skipped.
+    """
+    seen_months = set()
+    for month, entries in itertools.groupby(read_record_entries(file_path, parser), key=lambda entry: entry.date[:7]):
+        if month in seen_months:
+            first_entry = next(entries)
+            parser.errors.append((first_entry.line_number, f"The records of {month} are not together, sort the file by date"))
+            for _ in entries:
+                pass
+            continue
+        seen_months.add(month)
+        yield group_entries(entries)
+
+def year_working_days(date, calendar):
+    """
+    Returns the working days of the year of date. The calendar is fetched, or read from the cache,
+    a whole year at a time and kept in calendar, which only ever holds the current year.
+    """
+    year = date[:4]
+    if year not in calendar:
+        calendar.clear()
+        calendar[year] = get_working_days(f"{year}-01-01", f"{year}-12-31")
+    return calendar[year]
+
+def print_record_errors(file_path, errors):
+    for line_number, error in errors:
+        print(f"Error in {file_path}, line {line_number}: {error}")
+
+def validate_import_file(file_path):
+    """
+    Checks a whole JSONL or CSV file without writing anything: every record, the issues, accounts and
+    components, and the hours of every day, one month at a time. Every problem is reported.
+    Returns True if the file can be imported.
+    """
+    parser = WorklogParser()
+    valid = True
+    reported_errors = 0
+    calendar = {}
+    for entries_by_date, daily_seconds in read_record_batches(file_path, parser):
+        # The day totals of a month with invalid records would be misleading
+        batch_errors = parser.errors[reported_errors:]
+        reported_errors = len(parser.errors)
+        print_record_errors(file_path, batch_errors)
+        if not check_worklog_references((file_path, entries) for entries in entries_by_date.values()):
+            valid = False
+        if batch_errors:
+            continue
+        all_dates = sorted(entries_by_date)
+        try:
+            validate_worklogs(all_dates, daily_seconds, year_working_days(all_dates[0], calendar))
+        except ValueError as e:
+            print(f"Validation error: {e}")
+            valid = False
+
+    print_record_errors(file_path, parser.errors[reported_errors:])
+    if parser.errors:
+        print(f"Found {len(parser.errors)} invalid record(s) in {file_path}.")
+    return valid and not parser.errors
+
+def import_worklogs(file_path, jobs=1, validate_only=False):
+    """
+    Imports a JSONL or CSV file of worklog records, such as one written by export or by a migration
+    script, with constant memory however long it is. The whole file is validated first, then read
+    again and applied one month at a time like apply: existing worklogs are fetched once per month,
+    compared, confirmed and written, and the journal lets an interrupted import resume.
+    """
+    if not validate_import_file(file_path):
+        raise FatalError(f"{file_path} has invalid records; nothing was imported.")
+    if validate_only:
+        print("Records are valid.")
+        return
+
+    journal = open_journal()
+    mirror = open_mirror()
+    calendar = {}
+    for entries_by_date, daily_seconds in read_record_batches(file_path, WorklogParser()):
+        all_dates = sorted(entries_by_date)
+        # The calendar was cached by the validation pass
+        valid_dates = validate_worklogs(all_dates, daily_seconds, year_working_days(all_dates[0], calendar))
+        apply_worklog_days(entries_by_date, valid_dates, jobs, journal, mirror)
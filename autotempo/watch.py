@@ -0,0 +1,98 @@
+import os
+import time
+
+from .errors import FatalError
+from .journal import day_hash, open_journal
+from .mirror import open_mirror
+from .tempo import get_worker, get_working_days
+from .worklogs import apply_worklog_days, check_worklog_references, read_worklog_file, validate_worklogs
+
+def file_signature(file_path):
+    """Returns what identifies the current version of a file, or None while it does not exist."""
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def wait_for_change(file_path, signature, interval, debounce):
+    """
+    Polls the file every interval seconds until its signature differs from the given one and then
+    stays the same for debounce seconds, so that a burst of saves is synced once. Returns the new signature.
+    """
+    while True:
+        time.sleep(interval)
+        current = file_signature(file_path)
+        if current == signature:
+            continue
+        settled_since = time.monotonic()
+        while time.monotonic() - settled_since < debounce:
+            time.sleep(interval)
+            latest = file_signature(file_path)
+            if latest != current:
+                current = latest
+                settled_since = time.monotonic()
+        if current is not None and current != signature:
+            return current
+
+def sync_changed_days(file_path, synced_hashes, jobs, journal, mirror):
+    """
+    Parses the file and syncs the days whose worklogs differ from synced_hashes, which maps dates
+    to the content hashes last synced and is updated in place. Days that do not validate are
+    reported and left for a later save; the other changed days are synced. Days declined at the
+    confirmation prompt are not recorded as synced, so they are offered again after the next save.
+    """
+    parsed = read_worklog_file(file_path)
+    if parsed is None:
+        return
+    dates_processed, daily_seconds = parsed
+
+    day_hashes = {date: day_hash(entries) for date, entries in dates_processed.items()}
+    changed_dates = sorted(date for date, content_hash in day_hashes.items() if synced_hashes.get(date) != content_hash)
+    if not changed_dates:
+        print("No days changed.")
+        return
+
+    # Known issues and the allowed accounts and components are cached, so usually only newly typed keys are looked up
+    if not check_worklog_references((file_path, dates_processed[date]) for date in changed_dates):
+        return
+
+    # The calendar is cached after the first fetch, so this is normally answered from memory
+    working_days = get_working_days(changed_dates[0], changed_dates[-1])
+    valid_dates = []
+    for date in changed_dates:
+        try:
+            valid_dates += validate_worklogs([date], daily_seconds, working_days)
+        except ValueError as e:
+            print(f"Validation error: {e}")
+
+    if valid_dates:
+        print(f"Syncing {len(valid_dates)} changed day(s): {', '.join(valid_dates)}")
+        applied_dates = apply_worklog_days(dates_processed, valid_dates, jobs, journal, mirror)
+        synced_hashes.update((date, day_hashes[date]) for date in applied_dates)
+
+def watch_worklog_file(file_path, interval=1.0, debounce=2.0, jobs=1):
+    """
+    Keeps a worklog file in sync until interrupted. The HTTP session, JIRA user and calendar stay
+    warm between changes; on every save the file is parsed again and only the days whose content
+    changed since the last sync are compared with the server and written.
+    """
+    signature = file_signature(file_path)
+    if signature is None:
+        raise FatalError(f"File {file_path} not found.")
+
+    get_worker()
+    journal = open_journal()
+    mirror = open_mirror()
+    synced_hashes = {}
+    try:
+        while True:
+            try:
+                sync_changed_days(file_path, synced_hashes, jobs, journal, mirror)
+            except FatalError as e:
+                # Keep watching, the failed days are tried again after the next save
+                print(f"Sync failed: {e}")
+            print(f"Watching {file_path} for changes. Press Ctrl+C to stop.")
+            signature = wait_for_change(file_path, signature, interval, debounce)
+    except KeyboardInterrupt:
+        print("Stopped watching.")
@@ -0,0 +1,583 @@
+import concurrent.futures
+import functools
+import glob
+import itertools
+import os
+import threading
+
+from . import cache, metrics
+from .client import enable_rate_limit
+from .dates import date_ranges
+from .errors import FatalError
+from .journal import day_hash, open_journal
+from .mirror import open_mirror
+from .parser import WorklogParser, existing_worklog_entry
+from .tempo import (
+    WORK_ATTRIBUTE_KEYS, add_worklog, delete_worklogs, find_unknown_issues, get_existing_worklogs, get_work_attribute_values, get_worker, get_working_days,
+    is_issue_key, update_worklog
+)
+
+# Non-overtime time that has to be logged on every working day
+WORKING_DAY_SECONDS = 8 * 3600
+
+def validate_worklogs(all_dates, daily_seconds, working_days):
+    valid_dates = []
+    for date in sorted(all_dates):
+        total_hours = daily_seconds.get(date, 0) / 3600
+        if date in working_days:
+            if daily_seconds.get(date, 0) != WORKING_DAY_SECONDS:
+                raise ValueError(f"Total non-overtime logged hours for {date} is {total_hours}, which is not equal to 8. Stopping worklog application.")
+            valid_dates.append(date)
+        else:
+            if total_hours != 0:
+                raise ValueError(f"Non-overtime hours logged on non-working day {date} ({total_hours} hours). Stopping worklog application.")
+            else:
+                valid_dates.append(date)
+    return valid_dates
+
+def diff_worklogs(existing_worklogs, new_worklogs):
+    """
+    Computes the smallest set of changes turning the existing worklogs of a day into the new ones.
+
+    Both sides are compared as multisets of (ticket, seconds, account, component, comment).
+    Leftover worklogs with the same ticket, account and component on both sides are paired
+    into updates, so a changed comment or duration costs a single PUT instead of a delete and an add.
+
+    Returns (worklogs_to_delete, worklogs_to_update, worklogs_to_add), where worklogs_to_update
+    is a list of (existing worklog, new entry) pairs.
+    """
+    unmatched_existing = {}
+    for worklog in existing_worklogs:
+        unmatched_existing.setdefault(existing_worklog_entry(worklog).key(), []).append(worklog)
+
+    unmatched_new = []
+    for entry in new_worklogs:
+        candidates = unmatched_existing.get(entry.key())
+        if candidates:
+            candidates.pop(0)
+        else:
+            unmatched_new.append(entry)
+
+    # Keep the original order of the leftover existing worklogs
+    leftover_ids = {id(worklog) for worklogs in unmatched_existing.values() for worklog in worklogs}
+    updatable = {}
+    for worklog in existing_worklogs:
+        if id(worklog) in leftover_ids:
+            existing = existing_worklog_entry(worklog)
+            updatable.setdefault((existing.ticket, existing.account, existing.component), []).append(worklog)
+
+    worklogs_to_update = []
+    worklogs_to_add = []
+    for entry in unmatched_new:
+        candidates = updatable.get((entry.ticket, entry.account, entry.component))
+        if candidates:
+            worklogs_to_update.append((candidates.pop(0), entry))
+        else:
+            worklogs_to_add.append(entry)
+
+    worklogs_to_delete = [worklog for worklogs in updatable.values() for worklog in worklogs]
+    return worklogs_to_delete, worklogs_to_update, worklogs_to_add
+
+def apply_day_update(date, worklogs_to_delete, worklogs_to_update, worklogs_to_add, log=print, worker=None, journal=None, content_hash=None, mirror=None):
+    """
+    Deletes, updates and adds the worklogs of a single day.
+    With a journal, the operations are recorded before they start and each one once it is done,
+    and the day is marked complete with its content hash at the end.
+    With a mirror, every write is recorded in it as soon as the server confirms it.
+    """
+    operations = [functools.partial(delete_worklogs, [worklog], log) for worklog in worklogs_to_delete]
+    operations += [
+        functools.partial(update_worklog, worklog['tempoWorklogId'], entry.ticket, entry.hours, entry.account, entry.component, date, entry.comment, log, worker)
+        for worklog, entry in worklogs_to_update
+    ]
+    operations += [
+        functools.partial(add_worklog, entry.ticket, entry.hours, entry.account, entry.component, date, entry.comment, log, worker)
+        for entry in worklogs_to_add
+    ]
+
+    if journal:
+        worker = worker or get_worker()
+        if operations:
+            journal.record_plan(worker, date, content_hash, worklogs_to_delete, worklogs_to_update, worklogs_to_add)
+    for index, operation in enumerate(operations):
+        result = operation()
+        if mirror:
+            if index < len(worklogs_to_delete):
+                mirror.record_deleted(worklogs_to_delete[index]['tempoWorklogId'])
+            else:
+                mirror.record_saved(worker or get_worker(), result)
+        if journal:
+            journal.record_done(worker, date, index)
+    if journal:
+        journal.record_complete(worker, date, content_hash)
+
+@metrics.phase("writes")
+def apply_day_updates(updates, jobs=1, worker=None, journal=None, day_hashes=None, mirror=None):
+    """Applies the confirmed day updates, in parallel when jobs > 1."""
+    day_hashes = day_hashes or {}
+    if jobs > 1 and len(updates) > 1:
+        apply_day_updates_concurrently(updates, jobs, worker, journal, day_hashes, mirror)
+    else:
+        for update in updates:
+            apply_day_update(*update, worker=worker, journal=journal, content_hash=day_hashes.get(update[0]), mirror=mirror)
+
+def apply_day_update_buffered(update, worker=None, journal=None, day_hashes=None, mirror=None):
+    """Applies a day update, collecting its output instead of printing it. Returns (output lines, FatalError or None)."""
+    output = []
+    try:
+        apply_day_update(*update, log=output.append, worker=worker, journal=journal, content_hash=(day_hashes or {}).get(update[0]), mirror=mirror)
+        return output, None
+    except FatalError as e:
+        return output, e
+
+def apply_day_updates_concurrently(updates, jobs, worker=None, journal=None, day_hashes=None, mirror=None):
+    """
+    Applies the day updates on `jobs` threads, one day per task. The output of each day
+    is buffered and printed in date order, so it reads the same as a sequential run.
+    A failing day does not stop the others; failures are reported once all days finish.
+    """
+    def run(update):
+        return apply_day_update_buffered(update, worker, journal, day_hashes, mirror)
+
+    enable_rate_limit()
+
+    failed_dates = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        for (date, *_), (output, error) in zip(updates, executor.map(run, updates)):
+            for message in output:
+                print(message)
+            if error:
+                print(f"Failed to apply worklogs for {date}: {error}")
+                failed_dates.append(date)
+
+    if failed_dates:
+        raise FatalError(f"Failed to apply worklogs for {len(failed_dates)} day(s): {', '.join(failed_dates)}")
+
+def group_entries(entries):
+    """Groups a stream of entries by date. Returns (entries by date, non-overtime seconds by date)."""
+    entries_by_date = {}
+    daily_seconds = {}
+    for entry in entries:
+        entries_by_date.setdefault(entry.date, []).append(entry)
+        daily_seconds.setdefault(entry.date, 0)
+        if not entry.is_overtime:
+            daily_seconds[entry.date] += entry.seconds
+    return entries_by_date, daily_seconds
+
+@metrics.phase("parse")
+def read_worklog_file(file_path):
+    """
+    Parses a worklog file in a single pass, reporting every invalid line.
+    Returns (entries by date, non-overtime seconds by date), or None if any line is invalid.
+    """
+    parser = WorklogParser()
+    entries_by_date, daily_seconds = group_entries(parser.parse_file(file_path))
+
+    if parser.errors:
+        for line_number, error in parser.errors:
+            print(f"Error in {file_path}, line {line_number}: {error}")
+        print(f"Found {len(parser.errors)} invalid line(s) in {file_path}.")
+        return None
+
+    return entries_by_date, daily_seconds
+
+def expand_file_patterns(patterns):
+    """
+    Expands the glob patterns among the given file names, for shells that do not (or quoted patterns).
+    Accepts a single name or a list. Returns the file names in order, without duplicates.
+    """
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    file_paths = []
+    for pattern in patterns:
+        if any(char in pattern for char in "*?[") and not os.path.exists(pattern):
+            matches = sorted(glob.glob(pattern))
+            if not matches:
+                raise FatalError(f"No files match {pattern}.")
+            file_paths += matches
+        else:
+            file_paths.append(pattern)
+    return list(dict.fromkeys(file_paths))
+
+def read_worklog_files(file_paths):
+    """
+    Parses several worklog files into one set of days, reporting every invalid line of every file.
+    A date may only appear in one file; dates found in several files are reported as conflicts.
+    Returns (entries by date, non-overtime seconds by date, file by date), or None if any line
+    is invalid or any date conflicts.
+    """
+    entries_by_date = {}
+    daily_seconds = {}
+    date_files = {}
+    conflicts = {}
+    failed = False
+    for file_path in file_paths:
+        parsed = read_worklog_file(file_path)
+        if parsed is None:
+            failed = True
+            continue
+        file_entries, file_seconds = parsed
+        for date, entries in file_entries.items():
+            if date in date_files:
+                conflicts.setdefault(date, [date_files[date]]).append(file_path)
+                continue
+            date_files[date] = file_path
+            entries_by_date[date] = entries
+            daily_seconds[date] = file_seconds[date]
+
+    for date, conflicting_files in sorted(conflicts.items()):
+        print(f"Conflict: {date} appears in {', '.join(conflicting_files)}.")
+    if conflicts:
+        print(f"Found {len(conflicts)} date(s) in more than one file.")
+    if failed or conflicts:
+        return None
+    return entries_by_date, daily_seconds, date_files
+
+def check_issue_keys(entries_by_file):
+    """
+    Checks that the JIRA issues of all the given entries exist, with one batched search for all of them.
+    entries_by_file is a sequence of (file path, list of WorklogEntry) pairs. Every line naming an
+    unknown issue is reported. Returns True if all issues exist.
+    """
+    entries_by_file = list(entries_by_file)
+    unknown_keys = find_unknown_issues(entry.ticket for _, entries in entries_by_file for entry in entries)
+    if not unknown_keys:
+        return True
+    errors = sorted(
+        (file_path, entry.line_number or 0, entry.ticket)
+        for file_path, entries in entries_by_file
+        for entry in entries
+        if entry.ticket in unknown_keys
+    )
+    for file_path, line_number, ticket in errors:
+        if is_issue_key(ticket):
+            print(f"Error in {file_path}, line {line_number}: JIRA issue {ticket} does not exist.")
+        else:
+            print(f"Error in {file_path}, line {line_number}: '{ticket}' is not a valid JIRA issue key.")
+    print(f"Found {len(unknown_keys)} unknown or invalid JIRA issue key(s) on {len(errors)} line(s).")
+    return False
+
+def check_work_attributes(entries_by_file):
+    """
+    Checks the account and component of all the given entries against the values allowed by the
+    Tempo work attribute configuration, which is fetched once and cached, in a single local pass.
+    entries_by_file is a sequence of (file path, list of WorklogEntry) pairs. Returns True if all are allowed.
+    """
+    attribute_values = get_work_attribute_values()
+    account_values, component_values = (attribute_values.get(key) for key in WORK_ATTRIBUTE_KEYS)
+    allowed_accounts = set(account_values) if account_values is not None else None
+    allowed_components = set(component_values) if component_values is not None else None
+    if allowed_accounts is None and allowed_components is None:
+        return True
+
+    errors = []
+    for file_path, entries in entries_by_file:
+        for entry in entries:
+            if allowed_accounts is not None and entry.account not in allowed_accounts:
+                errors.append((file_path, entry.line_number or 0, f"Unknown account '{entry.account}'"))
+            if allowed_components is not None and entry.component not in allowed_components:
+                errors.append((file_path, entry.line_number or 0, f"Unknown component '{entry.component}'"))
+    for file_path, line_number, error in sorted(errors):
+        print(f"Error in {file_path}, line {line_number}: {error}.")
+    if errors:
+        print(f"Found {len(errors)} unknown account(s) or component(s).")
+    return not errors
+
+def check_worklog_references(entries_by_file):
+    """Checks the issues, accounts and components of the given (file path, entries) pairs, reporting all problems. Returns True if all exist."""
+    entries_by_file = list(entries_by_file)
+    issues_valid = check_issue_keys(entries_by_file)
+    return check_work_attributes(entries_by_file) and issues_valid
+
+def resume_from_journal(journal, worker, valid_dates, day_hashes):
+    """
+    Uses the apply journal to avoid server round trips: days applied before with the same
+    content are skipped. --refresh ignores the journal.
+    Days interrupted half-way are compared with the server again rather than replaying their
+    remaining operations, since the operation in flight may have reached Tempo before the
+    connection dropped; the changes confirmed for them before are not asked again.
+    Returns (dates that need to be compared with the server, IDs of the existing worklogs
+    already confirmed to change by date).
+    """
+    if journal is None or cache.REFRESH_CACHE:
+        return list(valid_dates), {}
+
+    dates_to_compare = []
+    confirmed_ids = {}
+    for date in valid_dates:
+        if journal.completed_hash(worker, date) == day_hashes[date]:
+            print(f"No changes in worklogs for {date} since the last apply. Skipping update.")
+            continue
+        worklog_ids = journal.confirmed_worklog_ids(worker, date, day_hashes[date])
+        if worklog_ids is not None:
+            print(f"Resuming interrupted update for {date}.")
+            confirmed_ids[date] = worklog_ids
+        dates_to_compare.append(date)
+    return dates_to_compare, confirmed_ids
+
+def print_day_diff(date, existing_worklogs, worklogs_to_delete, worklogs_to_update, worklogs_to_add):
+    if not (worklogs_to_delete or worklogs_to_update or worklogs_to_add):
+        print(f"No changes in worklogs for {date}. Skipping update.")
+    elif existing_worklogs:
+        print(f"Differences found for {date}:")
+        if worklogs_to_delete:
+            print("Worklogs to be deleted:")
+            for worklog in worklogs_to_delete:
+                print(existing_worklog_entry(worklog))
+        if worklogs_to_update:
+            print("Worklogs to be updated:")
+            for worklog, entry in worklogs_to_update:
+                print(f"{existing_worklog_entry(worklog)} -> {entry}")
+        if worklogs_to_add:
+            print("Worklogs to be added:")
+            for entry in worklogs_to_add:
+                print(entry)
+    else:
+        print(f"No existing worklogs for {date}. Adding new worklogs:")
+        for entry in worklogs_to_add:
+            print(entry)
+
+def get_existing_worklogs_for_dates(dates, worker=None):
+    """
+    Fetches the existing worklogs of the given days by date, with one search per range of
+    date_ranges, so that days months or years apart do not download everything in between.
+    """
+    existing_worklogs_by_date = {}
+    for start_date, end_date in date_ranges(dates):
+        existing_worklogs_by_date.update(get_existing_worklogs(start_date, end_date, worker))
+    return existing_worklogs_by_date
+
+def get_existing_worklogs_to_compare(dates, new_worklogs_by_date, worker, mirror=None):
+    """
+    Returns the existing worklogs of the given days by date, fetched in one search per range of
+    nearby days. With a mirror, only the days whose mirrored worklogs already match the new ones
+    are taken from it: the mirror does not see worklogs deleted in Tempo until its next full sync,
+    so the days that would be written are fetched from the server again, unless the sync just
+    fetched them in full.
+    """
+    if not mirror:
+        return get_existing_worklogs_for_dates(dates, worker)
+
+    fetched_dates = set()
+    existing_worklogs_by_date = {}
+    for start_date, end_date in date_ranges(dates):
+        fetched_dates.update(mirror.sync(worker, start_date, end_date))
+        existing_worklogs_by_date.update(mirror.get_existing_worklogs(start_date, end_date, worker, sync=False))
+    with metrics.phase("diff"):
+        changed_dates = [
+            date for date in dates
+            if date not in fetched_dates and any(diff_worklogs(existing_worklogs_by_date.get(date, []), new_worklogs_by_date[date]))
+        ]
+    fetched_worklogs_by_date = {}
+    for start_date, end_date in date_ranges(changed_dates):
+        fetched_worklogs_by_date.update(mirror.refresh(worker, start_date, end_date))
+    for date in changed_dates:
+        existing_worklogs_by_date[date] = fetched_worklogs_by_date.get(date, [])
+    return existing_worklogs_by_date
+
+def plan_day_updates(valid_dates, new_worklogs_by_date, existing_worklogs_by_date, confirm=True, confirmed_ids=None):
+    """
+    Compares the new and existing worklogs of every valid day, printing the differences and,
+    if confirm is set, asking for confirmation where existing worklogs would change, unless
+    confirmed_ids holds all of them for the day. Nothing is written yet.
+    Returns the (date, worklogs_to_delete, worklogs_to_update, worklogs_to_add) updates, including
+    empty ones for unchanged days, so that they can be recorded as applied.
+    """
+    updates = []
+    for date in valid_dates:
+        existing_worklogs = existing_worklogs_by_date.get(date, [])
+        new_worklogs = new_worklogs_by_date[date]
+        with metrics.phase("diff"):
+            worklogs_to_delete, worklogs_to_update, worklogs_to_add = diff_worklogs(existing_worklogs, new_worklogs)
+        print_day_diff(date, existing_worklogs, worklogs_to_delete, worklogs_to_update, worklogs_to_add)
+
+        if confirm and not confirm_day_update(date, worklogs_to_delete, worklogs_to_update, (confirmed_ids or {}).get(date, ())):
+            continue
+        updates.append((date, worklogs_to_delete, worklogs_to_update, worklogs_to_add))
+
+    return updates
+
+def confirm_day_update(date, worklogs_to_delete, worklogs_to_update, confirmed_ids=()):
+    """
+    Asks for confirmation if existing worklogs of a day would change, unless all of them are in
+    confirmed_ids. Returns False if the day should be skipped.
+    """
+    # Changing or removing logged work needs confirmation, plain additions do not
+    changed_ids = {worklog['tempoWorklogId'] for worklog in worklogs_to_delete}
+    changed_ids.update(worklog['tempoWorklogId'] for worklog, _ in worklogs_to_update)
+    if changed_ids <= set(confirmed_ids):
+        return True
+    answer = input(f"Are you sure you want to change existing worklogs for {date}? (yes/no): ").strip().lower()
+    if answer != 'yes':
+        print(f"Skipping update for {date}.")
+        return False
+    return True
+
+class DayDiffPrefetcher:
+    """
+    Fetches the existing worklogs of the given days one month at a time on a background thread,
+    and diffs every day as soon as its month has arrived, so that the next days are ready
+    while the user is still answering a prompt.
+    """
+    def __init__(self, dates, new_worklogs_by_date, worker, mirror=None):
+        self.results = {}
+        self.error = None
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self._run, args=(dates, new_worklogs_by_date, worker, mirror), daemon=True)
+        self.thread.start()
+
+    def _run(self, dates, new_worklogs_by_date, worker, mirror):
+        try:
+            for _, month_dates in itertools.groupby(sorted(dates), key=lambda date: date[:7]):
+                month_dates = list(month_dates)
+                existing_worklogs_by_date = get_existing_worklogs_to_compare(month_dates, new_worklogs_by_date, worker, mirror)
+                for date in month_dates:
+                    existing_worklogs = existing_worklogs_by_date.get(date, [])
+                    with metrics.phase("diff"):
+                        diff = diff_worklogs(existing_worklogs, new_worklogs_by_date[date])
+                    with self.condition:
+                        self.results[date] = (existing_worklogs, *diff)
+                        self.condition.notify_all()
+        except Exception as e:
+            with self.condition:
+                self.error = e
+                self.condition.notify_all()
+
+    def get(self, date):
+        """Waits for the diff of a day. Returns (existing worklogs, worklogs_to_delete, worklogs_to_update, worklogs_to_add)."""
+        with self.condition:
+            while date not in self.results and self.error is None:
+                self.condition.wait()
+            if date in self.results:
+                return self.results.pop(date)
+            raise self.error
+
+class AsyncDayWriter:
+    """
+    Applies confirmed day updates on `jobs` background threads while the next days are reviewed.
+    The output of the finished days is printed between prompts, in the order the days were submitted.
+    """
+    def __init__(self, jobs=1, worker=None, journal=None, day_hashes=None, mirror=None):
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, jobs))
+        if jobs > 1:
+            enable_rate_limit()
+        self.worker = worker
+        self.journal = journal
+        self.day_hashes = day_hashes
+        self.mirror = mirror
+        self.pending = []
+        self.failed_dates = []
+
+    def submit(self, update):
+        future = self.executor.submit(apply_day_update_buffered, update, self.worker, self.journal, self.day_hashes, self.mirror)
+        self.pending.append((update[0], future))
+
+    def print_finished(self, wait=False):
+        """Prints the output of the days written so far, or of all of them if wait is set."""
+        while self.pending and (wait or self.pending[0][1].done()):
+            date, future = self.pending.pop(0)
+            output, error = future.result()
+            for message in output:
+                print(message)
+            if error:
+                print(f"Failed to apply worklogs for {date}: {error}")
+                self.failed_dates.append(date)
+
+    def finish(self):
+        """Waits for all writes and raises a FatalError listing the days that failed."""
+        self.print_finished(wait=True)
+        self.executor.shutdown()
+        if self.failed_dates:
+            raise FatalError(f"Failed to apply worklogs for {len(self.failed_dates)} day(s): {', '.join(self.failed_dates)}")
+
+def read_valid_worklogs(file_paths):
+    """
+    Parses and validates one or more worklog files (names or glob patterns) against the
+    working-day calendar, which is fetched once for every range of nearby dates (see date_ranges),
+    so that files months apart do not fetch the calendar in between.
+    Returns (entries by date, valid dates), or None if a line cannot be parsed, a date is in several
+    files or an issue does not exist.
+    Raises ValueError if the hours of a day are not valid.
+    """
+    parsed = read_worklog_files(expand_file_patterns(file_paths))
+    if parsed is None:
+        return None
+    dates_processed, daily_seconds, date_files = parsed
+
+    # Catch typos in issue keys, accounts and components now, rather than half-way through applying a day
+    if not check_worklog_references((date_files[date], entries) for date, entries in dates_processed.items()):
+        return None
+
+    # Determine the date ranges for validation
+    all_dates = list(dates_processed.keys())
+    working_days = set()
+    for start_date, end_date in date_ranges(all_dates):
+        working_days |= get_working_days(start_date, end_date)
+
+    # Validate worklogs, ensuring no worklogs on non-working days
+    return dates_processed, validate_worklogs(all_dates, daily_seconds, working_days)
+
+def apply_worklog_days(dates_processed, valid_dates, jobs=1, journal=None, mirror=None):
+    """
+    Brings the given valid days in line with the parsed worklogs: days recorded in the journal as
+    applied are skipped, the existing worklogs of the others are fetched in one search per range of
+    nearby days (or from the mirror, and the server for the days to write), compared, confirmed and then written.
+    Returns the valid dates that are now in line with the parsed worklogs, that is all of them but
+    the days declined at the confirmation prompt.
+    """
+    worker = get_worker()
+    day_hashes = {date: day_hash(dates_processed[date]) for date in valid_dates}
+    dates_to_compare, confirmed_ids = resume_from_journal(journal, worker, valid_dates, day_hashes)
+
+    # Fetch existing worklogs for each range of nearby days at once, or only what changed if they are mirrored
+    existing_worklogs_by_date = get_existing_worklogs_to_compare(dates_to_compare, dates_processed, worker, mirror)
+
+    # Compare worklogs only for valid dates, collecting all confirmations before any writes
+    updates = plan_day_updates(dates_to_compare, dates_processed, existing_worklogs_by_date, confirmed_ids=confirmed_ids)
+    apply_day_updates(updates, jobs, journal=journal, day_hashes=day_hashes, mirror=mirror)
+    declined_dates = set(dates_to_compare) - {date for date, *_ in updates}
+    return [date for date in valid_dates if date not in declined_dates]
+
+@metrics.phase("pipeline")
+def apply_worklog_days_pipelined(dates_processed, valid_dates, jobs=1, journal=None, mirror=None):
+    """
+    Like apply_worklog_days, but overlaps the network with the prompts: existing worklogs are
+    fetched and diffed month by month in the background, and every confirmed day is written in
+    the background while the next one is reviewed.
+    """
+    worker = get_worker()
+    day_hashes = {date: day_hash(dates_processed[date]) for date in valid_dates}
+    dates_to_compare, confirmed_ids = resume_from_journal(journal, worker, valid_dates, day_hashes)
+
+    prefetcher = DayDiffPrefetcher(dates_to_compare, dates_processed, worker, mirror)
+    writer = AsyncDayWriter(jobs, worker, journal, day_hashes, mirror)
+    try:
+        for date in dates_to_compare:
+            existing_worklogs, worklogs_to_delete, worklogs_to_update, worklogs_to_add = prefetcher.get(date)
+            writer.print_finished()
+            print_day_diff(date, existing_worklogs, worklogs_to_delete, worklogs_to_update, worklogs_to_add)
+            if confirm_day_update(date, worklogs_to_delete, worklogs_to_update, confirmed_ids.get(date, ())):
+                writer.submit((date, worklogs_to_delete, worklogs_to_update, worklogs_to_add))
+    finally:
+        # Days confirmed before an error or Ctrl+C are still written
+        writer.finish()
+
+def process_worklog_file(file_paths, jobs=1, pipeline=False):
+    """Applies one or more worklog files (names or glob patterns) as one set of days."""
+    parsed = read_valid_worklogs(file_paths)
+    if parsed is None:
+        return
+    dates_processed, valid_dates = parsed
+    apply_days = apply_worklog_days_pipelined if pipeline else apply_worklog_days
+    apply_days(dates_processed, valid_dates, jobs, open_journal(), open_mirror())
+
+def validate_worklog_file(file_paths):
+    try:
+        parsed = read_valid_worklogs(file_paths)
+    except ValueError as e:
+        print(f"Validation error: {e}")
+        return False
+    if parsed is None:
+        return False
+    print("Worklogs are valid.")
+    return True
@@ -0,0 +1,236 @@
+"""
+A local stand-in for the JIRA and Tempo endpoints used by autotempo, built on the standard library.
+
+Implements GET /rest/api/2/myself, POST /rest/api/2/search for "key in (...)" queries (every issue
+exists unless listed in missing_issues), GET /rest/tempo-core/1/work-attribute with an account attribute
+and a static list of components, GET /rest/tempo-accounts/1/account, POST .../private/days/search
+(Monday to Friday are working days),
+POST .../worklogs/search (with the updatedFrom filter, paged with offset and maxResults, optionally
+capped at page_limit worklogs per page) and POST, PUT and DELETE .../worklogs.
+Worklogs are kept in memory.
+Every response can be delayed by a fixed latency, and every n-th request can be answered with
+429 Too Many Requests to exercise the retry path.
+
+Run it on its own with: python benchmarks/mock_server.py --port 8080 [--latency-ms 50] [--throttle-every 10]
+"""
+import argparse
+import datetime
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+TEMPO = "/rest/tempo-timesheets/4"
+ID_SEGMENT = re.compile(r"/\d+$")
+
+class MockTempoServer:
+    """In-memory Tempo state plus the HTTP server serving it, on a background thread."""
+    def __init__(self, port=0, latency=0.0, throttle_every=0, user_key="JIRAUSER1", missing_issues=(),
+                 accounts=("INTERNAL", "CUSTOMER"), components=("Meetings", "Development"), page_limit=None):
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.user_key = user_key
+        self.missing_issues = set(missing_issues)
+        self.accounts = list(accounts)
+        self.components = list(components)
+        self.page_limit = page_limit
+        self.lock = threading.Lock()
+        self.reset()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def reset(self):
+        """Forgets all worklogs and request counts."""
+        with self.lock:
+            self.worklogs = {}
+            self.next_id = 1
+            self.request_count = 0
+            self.counts = {}
+
+    def reset_counts(self):
+        with self.lock:
+            self.request_count = 0
+            self.counts = {}
+
+    def stats(self):
+        """Returns the number of requests per endpoint (and status) since the last reset."""
+        with self.lock:
+            return dict(self.counts)
+
+    def _count(self, endpoint):
+        """Counts a request and returns True if it should be throttled."""
+        with self.lock:
+            self.request_count += 1
+            throttled = bool(self.throttle_every) and self.request_count % self.throttle_every == 0
+            key = f"{endpoint} 429" if throttled else endpoint
+            self.counts[key] = self.counts.get(key, 0) + 1
+            return throttled
+
+    def issue_search(self, body):
+        match = re.search(r"key in \(([^)]*)\)", body.get("jql", ""))
+        keys = [key.strip().strip('"') for key in match.group(1).split(",")] if match else []
+        issues = [{"key": key} for key in keys if key not in self.missing_issues]
+        return {"startAt": 0, "maxResults": body.get("maxResults", 50), "total": len(issues), "issues": issues}
+
+    def work_attributes(self):
+        return [
+            {"id": 1, "key": "_Initiative_", "name": "Account", "type": {"value": "ACCOUNT"}},
+            {
+                "id": 2, "key": "_Componenttool_", "name": "Component/tool", "type": {"value": "STATIC_LIST"},
+                "staticListValues": [{"value": component, "name": component, "removed": False} for component in self.components],
+            },
+        ]
+
+    def days_search(self, body):
+        day = datetime.date.fromisoformat(body["from"])
+        end = datetime.date.fromisoformat(body["to"])
+        days = []
+        while day <= end:
+            days.append({"date": day.isoformat(), "type": "WORKING_DAY" if day.weekday() < 5 else "NON_WORKING_DAY"})
+            day += datetime.timedelta(days=1)
+        return [{"userKey": user_key, "days": days} for user_key in body.get("userKeys") or [self.user_key]]
+
+    def worklogs_search(self, body):
+        workers = set(body.get("worker") or [self.user_key])
+        updated_from = body.get("updatedFrom", "")
+        with self.lock:
+            worklogs = [
+                worklog for worklog in self.worklogs.values()
+                if body["from"] <= worklog["started"][:10] <= body["to"] and worklog["worker"] in workers
+                and worklog["dateUpdated"][:10] >= updated_from
+            ]
+        offset = body.get("offset", 0)
+        page_size = min(size for size in (body.get("maxResults"), self.page_limit, len(worklogs)) if size is not None)
+        return worklogs[offset:offset + page_size]
+
+    def save_worklog(self, body, worklog_id=None):
+        with self.lock:
+            if worklog_id is None:
+                worklog_id = self.next_id
+                self.next_id += 1
+            elif worklog_id not in self.worklogs:
+                return None
+            ticket = body["originTaskId"]
+            worklog = {
+                "tempoWorklogId": worklog_id,
+                "issue": {"key": ticket},
+                "originTaskId": ticket,
+                "worker": body["worker"],
+                "timeSpentSeconds": body["timeSpentSeconds"],
+                # Tempo fills in a default comment when none is given
+                "comment": body["comment"] or f"Working on issue {ticket}",
+                "attributes": {key: {"value": attribute["value"]} for key, attribute in body["attributes"].items()},
+                "started": f"{body['started']} 00:00:00.000",
+                "dateUpdated": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.000"),
+            }
+            self.worklogs[worklog_id] = worklog
+            return worklog
+
+    def delete_worklog(self, worklog_id):
+        with self.lock:
+            return self.worklogs.pop(worklog_id, None) is not None
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Buffer the headers and body of a response into a single send, avoiding delayed-ACK stalls on keep-alive connections
+            wbufsize = -1
+
+            def log_message(self, format, *args):
+                pass
+
+            def send_json(self, status, data=None):
+                body = json.dumps(data).encode() if data is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def read_json(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(length) or b"null")
+
+            def handle_api(self, method):
+                path = urlsplit(self.path).path
+                body = self.read_json() if method in ("POST", "PUT") else None
+                endpoint = f"{method} {ID_SEGMENT.sub('/{id}', path)}"
+                if server.latency:
+                    time.sleep(server.latency)
+                if server._count(endpoint):
+                    self.send_response(429)
+                    self.send_header("Retry-After", "0")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                match = re.fullmatch(rf"{TEMPO}/worklogs/(\d+)", path)
+                if method == "GET" and path == "/rest/api/2/myself":
+                    self.send_json(200, {"key": server.user_key})
+                elif method == "GET" and path == "/rest/tempo-core/1/work-attribute":
+                    self.send_json(200, server.work_attributes())
+                elif method == "GET" and path == "/rest/tempo-accounts/1/account":
+                    self.send_json(200, [{"key": account, "name": account, "status": "OPEN"} for account in server.accounts])
+                elif method == "POST" and path == "/rest/api/2/search":
+                    self.send_json(200, server.issue_search(body))
+                elif method == "POST" and path == f"{TEMPO}/private/days/search":
+                    self.send_json(200, server.days_search(body))
+                elif method == "POST" and path == f"{TEMPO}/worklogs/search":
+                    self.send_json(200, server.worklogs_search(body))
+                elif method == "POST" and path == f"{TEMPO}/worklogs":
+                    self.send_json(200, [server.save_worklog(body)])
+                elif method == "PUT" and match:
+                    worklog = server.save_worklog(body, int(match.group(1)))
+                    self.send_json(200 if worklog else 404, worklog or {})
+                elif method == "DELETE" and match:
+                    self.send_json(204 if server.delete_worklog(int(match.group(1))) else 404)
+                else:
+                    self.send_json(404, {})
+
+            def do_GET(self):
+                self.handle_api("GET")
+
+            def do_POST(self):
+                self.handle_api("POST")
+
+            def do_PUT(self):
+                self.handle_api("PUT")
+
+            def do_DELETE(self):
+                self.handle_api("DELETE")
+
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local mock JIRA/Tempo server.")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Delay added to every response")
+    parser.add_argument("--throttle-every", type=int, default=0, metavar="N", help="Answer every N-th request with 429")
+    args = parser.parse_args()
+    server = MockTempoServer(args.port, args.latency_ms / 1000, args.throttle_every)
+    print(f"Mock JIRA/Tempo server listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
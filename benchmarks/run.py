@@ -0,0 +1,188 @@
+"""
+Benchmarks the generate, validate and apply paths of autotempo against the local mock server.
+
+Each scenario gets a fresh mock server, working directory, cache and journal, and runs the
+commands in sequence: generate, a validate ignoring the cache (--refresh) and one using it,
+an apply onto an empty server, a second apply of the unchanged file, which the journal answers
+without the server, and a third one with --refresh, which fetches and compares every day. autotempo runs in a
+subprocess exactly as from the command line, so the wall times include interpreter start-up.
+The paged scenario is the year one against a server returning at most 50 worklogs per search page:
+its refreshed apply must find every worklog and write nothing.
+
+Usage: python benchmarks/run.py [--latency-ms 20] [--throttle-every 50] [--jobs 4] [--mirror] [--only month,year] [--json results.json]
+"""
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from mock_server import MockTempoServer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CONFIG = """
+[JIRA]
+JIRA_URL = "{url}"
+API_TOKEN = "benchmark"
+
+[user]
+email = "benchmark@example.com"
+
+[keyword.scrum]
+ticket = "INT-1"
+account = "INTERNAL"
+component = "Meetings"
+
+[project.PROJ]
+account = "CUSTOMER"
+component = "Development"
+
+[http]
+rate_limit = {rate_limit}
+backoff = 0.01
+
+[mirror]
+enabled = {mirror}
+
+[team]
+{team}
+
+[[automatic]]
+day_of_week = "Mon-Fri"
+worklogs = ["0.25 scrum \\"Daily Scrum\\""]
+"""
+
+TEAM_SIZE = 30
+
+def working_days(start, end):
+    day = datetime.date.fromisoformat(start)
+    end = datetime.date.fromisoformat(end)
+    while day <= end:
+        if day.weekday() < 5:
+            yield day.isoformat()
+        day += datetime.timedelta(days=1)
+
+def worklog_lines(start, end):
+    for index, day in enumerate(working_days(start, end)):
+        yield f"{day} 0.25 scrum \"Daily Scrum\""
+        yield f"{day} 7.75 PROJ-{index % 50 + 1} \"Benchmark work\""
+
+def write_worklog_file(path, start, end):
+    with open(path, "w") as f:
+        f.write("\n".join(worklog_lines(start, end)) + "\n")
+
+# name: (first day, last day, months to generate, number of users, worklogs per search page or None)
+SCENARIOS = {
+    "day": ("2025-01-06", "2025-01-06", "2025-01", 1, None),
+    "month": ("2025-01-01", "2025-01-31", "2025-01", 1, None),
+    "year": ("2025-01-01", "2025-12-31", "2025-01..2025-12", 1, None),
+    "paged": ("2025-01-01", "2025-12-31", "2025-01..2025-12", 1, 50),
+    "team": ("2025-01-01", "2025-01-31", None, TEAM_SIZE, None),
+}
+
+def run_command(server, workdir, args, env, stdin=""):
+    """Runs one autotempo command. Returns (wall seconds, requests per endpoint, exit code, output)."""
+    server.reset_counts()
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-m", "autotempo", *args],
+        cwd=workdir, env=env, input=stdin, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - start
+    return elapsed, server.stats(), process.returncode, process.stdout + process.stderr
+
+def run_scenario(name, latency, throttle_every, jobs, rate_limit, mirror=False):
+    start, end, months, users, page_limit = SCENARIOS[name]
+    server = MockTempoServer(latency=latency, throttle_every=throttle_every, page_limit=page_limit).start()
+    results = []
+    try:
+        with tempfile.TemporaryDirectory(prefix=f"autotempo-bench-{name}-") as workdir:
+            team = "\n".join(f"user{index} = \"JIRAUSER{index + 100}\"" for index in range(users)) if users > 1 else ""
+            with open(os.path.join(workdir, "config.toml"), "w") as f:
+                f.write(CONFIG.format(url=server.url, rate_limit=rate_limit, mirror=str(mirror).lower(), team=team))
+            env = dict(
+                os.environ,
+                PYTHONPATH=REPO_ROOT,
+                XDG_CACHE_HOME=os.path.join(workdir, "cache"),
+                XDG_STATE_HOME=os.path.join(workdir, "state"),
+            )
+
+            if users > 1:
+                team_dir = os.path.join(workdir, "team")
+                os.mkdir(team_dir)
+                for index in range(users):
+                    write_worklog_file(os.path.join(team_dir, f"user{index}.jira"), start, end)
+                commands = [
+                    ("validate (cold)", ["team", "team", "--validate-only", "--refresh"]),
+                    ("validate (warm)", ["team", "team", "--validate-only"]),
+                    ("apply", ["team", "team", "--jobs", str(jobs)]),
+                    ("apply (unchanged)", ["team", "team", "--jobs", str(jobs)]),
+                    ("apply (refresh)", ["team", "team", "--jobs", str(jobs), "--refresh"]),
+                ]
+            else:
+                write_worklog_file(os.path.join(workdir, "worklogs.jira"), start, end)
+                commands = [
+                    ("generate", ["generate", months]),
+                    ("validate (cold)", ["validate", "worklogs.jira", "--refresh"]),
+                    ("validate (warm)", ["validate", "worklogs.jira"]),
+                    ("apply", ["apply", "worklogs.jira", "--jobs", str(jobs)]),
+                    ("apply (unchanged)", ["apply", "worklogs.jira", "--jobs", str(jobs)]),
+                    ("apply (refresh)", ["apply", "worklogs.jira", "--jobs", str(jobs), "--refresh"]),
+                ]
+
+            for label, args in commands:
+                elapsed, counts, returncode, output = run_command(server, workdir, args, env)
+                if returncode != 0:
+                    print(f"{name} {label} failed with exit code {returncode}:\n{output}", file=sys.stderr)
+                results.append({
+                    "scenario": name,
+                    "command": label,
+                    "seconds": elapsed,
+                    "requests": sum(counts.values()),
+                    "throttled": sum(count for endpoint, count in counts.items() if endpoint.endswith(" 429")),
+                    "endpoints": counts,
+                    "exit_code": returncode,
+                })
+    finally:
+        server.stop()
+    return results
+
+def print_results(results):
+    print(f"{'scenario':<8} {'command':<18} {'wall (s)':>9} {'requests':>9} {'429s':>6}")
+    for result in results:
+        status = "" if result["exit_code"] == 0 else f"  (exit code {result['exit_code']})"
+        print(
+            f"{result['scenario']:<8} {result['command']:<18} {result['seconds']:>9.3f} "
+            f"{result['requests']:>9} {result['throttled']:>6}{status}"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark autotempo against a local mock JIRA/Tempo server.")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Delay added to every mock response (default: 0)")
+    parser.add_argument("--throttle-every", type=int, default=0, metavar="N", help="Answer every N-th request with 429 (default: never)")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="--jobs passed to apply and team (default: 1)")
+    parser.add_argument("--rate-limit", type=float, default=0, help="rate_limit of the [http] section (default: 0, unlimited)")
+    parser.add_argument("--mirror", action="store_true", help="Enable the local SQLite worklog mirror")
+    parser.add_argument("--only", help=f"Comma separated scenarios to run, out of {', '.join(SCENARIOS)}")
+    parser.add_argument("--json", metavar="FILE", help="Also write the results to FILE as JSON")
+    args = parser.parse_args()
+
+    names = args.only.split(",") if args.only else list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    results = []
+    for name in names:
+        results += run_scenario(name, args.latency_ms / 1000, args.throttle_every, args.jobs, args.rate_limit, args.mirror)
+    print_results(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
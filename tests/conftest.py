@@ -0,0 +1,33 @@
+import pytest
+
+from autotempo.config import config
+
+CONFIG = """
+[JIRA]
+JIRA_URL = "https://jira.example.com"
+API_TOKEN = "test"
+
+[user]
+email = "test@example.com"
+
+[keyword.scrum]
+ticket = "INT-1"
+account = "INTERNAL"
+component = "Meetings"
+
+[project.PROJ]
+account = "CUSTOMER"
+component = "Development"
+"""
+
+@pytest.fixture(autouse=True)
+def test_config(tmp_path, monkeypatch):
+    """Loads a small configuration, with the cache and the journal in a temporary directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("XDG_STATE_HOME", str(tmp_path / "state"))
+    config_path = tmp_path / "config.toml"
+    config_path.write_text(CONFIG)
+    config.load(str(config_path))
+    yield config
+    config._data = None
+    config.path = "config.toml"
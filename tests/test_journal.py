@@ -0,0 +1,87 @@
+import json
+
+from autotempo import journal as journal_module
+from autotempo.journal import Journal, day_hash, update_from_records
+from autotempo.parser import WorklogEntry
+
+DATE = "2025-01-06"
+WORKER = "JIRAUSER1"
+
+def entry(ticket, hours, comment=""):
+    return WorklogEntry(DATE, int(hours * 3600), ticket, "CUSTOMER", "Development", comment)
+
+def record_interrupted_plan(journal, done_indexes, content_hash="hash", date=DATE):
+    """Records a plan deleting worklog 1, updating worklog 2 and adding one, of which done_indexes were done."""
+    journal.record_plan(WORKER, date, content_hash, [{"tempoWorklogId": 1}], [({"tempoWorklogId": 2}, entry("PROJ-2", 4, "new"))], [entry("PROJ-3", 2)])
+    for index in done_indexes:
+        journal.record_done(WORKER, date, index)
+
+def test_day_hash_ignores_the_order_of_entries():
+    first, second = entry("PROJ-1", 4), entry("PROJ-2", 4)
+    assert day_hash([first, second]) == day_hash([second, first])
+    assert day_hash([first, second]) != day_hash([first, entry("PROJ-2", 4, "changed")])
+
+def test_replay_restores_pending_and_completed_days(tmp_path):
+    path = str(tmp_path / "journal")
+    journal = Journal(path)
+    record_interrupted_plan(journal, [0])
+    journal.record_plan(WORKER, "2025-01-07", "other", [], [], [entry("PROJ-1", 8)])
+    journal.record_done(WORKER, "2025-01-07", 0)
+    journal.record_complete(WORKER, "2025-01-07", "other")
+
+    reloaded = Journal(path)
+    assert reloaded.completed_hash(WORKER, "2025-01-07") == "other"
+    assert reloaded.completed_hash(WORKER, DATE) is None
+    content_hash, operations, done = reloaded.pending[(WORKER, DATE)]
+    assert (content_hash, [operation["op"] for operation in operations], done) == ("hash", ["delete", "update", "add"], {0})
+
+def test_a_torn_last_record_is_ignored(tmp_path):
+    path = str(tmp_path / "journal")
+    record_interrupted_plan(Journal(path), [0])
+    with open(path, "a") as f:
+        f.write('{"type": "done", "worker": "JIRAUSER1", "da')
+    assert Journal(path).pending[(WORKER, DATE)][2] == {0}
+
+def test_confirmed_worklog_ids_of_an_interrupted_day(tmp_path):
+    journal = Journal(str(tmp_path / "journal"))
+    assert journal.confirmed_worklog_ids(WORKER, DATE, "hash") is None
+    record_interrupted_plan(journal, [0])
+    assert journal.confirmed_worklog_ids(WORKER, DATE, "hash") == {1, 2}
+    # The file was edited since: the old confirmation does not cover the new content
+    assert journal.confirmed_worklog_ids(WORKER, DATE, "edited") is None
+    journal.record_complete(WORKER, DATE, "hash")
+    assert journal.confirmed_worklog_ids(WORKER, DATE, "hash") is None
+
+def test_update_from_records_skips_done_operations(tmp_path):
+    journal = Journal(str(tmp_path / "journal"))
+    record_interrupted_plan(journal, [0, 1])
+    _, operations, done = journal.pending[(WORKER, DATE)]
+    date, worklogs_to_delete, worklogs_to_update, worklogs_to_add = update_from_records(DATE, operations, done)
+    assert (date, worklogs_to_delete, worklogs_to_update) == (DATE, [], [])
+    assert [(added.ticket, added.seconds) for added in worklogs_to_add] == [("PROJ-3", 7200)]
+
+def test_compaction_keeps_only_the_records_still_needed(tmp_path):
+    path = str(tmp_path / "journal")
+    journal = Journal(path)
+    for index in range(10):
+        journal.record_complete(WORKER, DATE, f"hash {index}")
+    record_interrupted_plan(journal, [0], content_hash="pending", date="2025-01-07")
+    journal._compact()
+
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+    assert [record["type"] for record in records] == ["complete", "plan", "done"]
+    reloaded = Journal(path)
+    assert reloaded.completed_hash(WORKER, DATE) == "hash 9"
+    assert reloaded.pending[(WORKER, "2025-01-07")][2] == {0}
+
+def test_loading_a_long_journal_compacts_it(tmp_path, monkeypatch):
+    monkeypatch.setattr(journal_module, "COMPACT_THRESHOLD", 5)
+    path = str(tmp_path / "journal")
+    journal = Journal(path)
+    for index in range(10):
+        journal.record_complete(WORKER, DATE, f"hash {index}")
+
+    assert Journal(path).completed_hash(WORKER, DATE) == "hash 9"
+    with open(path) as f:
+        assert len(f.readlines()) == 1
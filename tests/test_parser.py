@@ -0,0 +1,56 @@
+import pytest
+
+from autotempo.parser import WorklogParser
+
+def parse(text):
+    parser = WorklogParser()
+    return list(parser.parse(text.splitlines())), parser.errors
+
+def test_resolves_projects_keywords_and_overrides():
+    entries, errors = parse(
+        '2025-01-06 7.75 PROJ-12 "Fix login"\n'
+        '2025-01-06 0.25 scrum "Daily Scrum"\n'
+        '2025-01-07 8 PROJ-3 account:INTERNAL component:Meetings Planning\n'
+    )
+    assert errors == []
+    assert [(entry.ticket, entry.seconds, entry.account, entry.component, entry.comment) for entry in entries] == [
+        ("PROJ-12", 27900, "CUSTOMER", "Development", "Fix login"),
+        ("INT-1", 900, "INTERNAL", "Meetings", "Daily Scrum"),
+        ("PROJ-3", 28800, "INTERNAL", "Meetings", "Planning"),
+    ]
+
+def test_overtime_is_marked_by_a_leading_plus():
+    (entry,), _ = parse("2025-01-06 +1.5 PROJ-1 Release\n")
+    assert entry.seconds == 5400
+    assert entry.is_overtime
+
+def test_every_invalid_line_is_reported_with_its_line_number():
+    entries, errors = parse(
+        "# January\n"
+        "\n"
+        "2025-01-06 8 PROJ-1 ok\n"
+        "2025-13-01 8 PROJ-1 bad date\n"
+        "2025-01-07 eight PROJ-1 bad hours\n"
+        "2025-01-08 8 NOPE-1 unknown project\n"
+        "2025-01-09 8\n"
+        "2025-01-10 8 PROJ-1 ok\n"
+    )
+    assert [entry.line_number for entry in entries] == [3, 8]
+    assert [line_number for line_number, _ in errors] == [4, 5, 6, 7]
+    assert "Invalid date '2025-13-01'" in errors[0][1]
+    assert "Invalid hours 'eight'" in errors[1][1]
+    assert "Unknown project or keyword" in errors[2][1]
+    assert "Invalid entry" in errors[3][1]
+
+@pytest.mark.parametrize("hours", ["inf", "-inf", "nan", "1e400"])
+def test_non_finite_hours_are_invalid_lines(hours):
+    entries, errors = parse(f"2025-01-06 {hours} PROJ-1 x\n")
+    assert entries == []
+    assert errors == [(1, f"Invalid hours '{hours}'")]
+
+def test_records_are_parsed_like_lines():
+    parser = WorklogParser()
+    entry = parser.parse_record({"date": "2025-01-06", "hours": "+2", "ticket": "scrum", "comment": "Retro"}, 4)
+    assert (entry.ticket, entry.seconds, entry.account, entry.is_overtime, entry.line_number) == ("INT-1", 7200, "INTERNAL", True, 4)
+    with pytest.raises(ValueError, match="Unknown project or keyword 'OTHER-1'"):
+        parser.parse_record({"date": "2025-01-06", "hours": 1, "ticket": "OTHER-1"})
@@ -0,0 +1,156 @@
+import pytest
+
+from autotempo import worklogs
+from autotempo.errors import FatalError
+from autotempo.journal import Journal
+from autotempo.parser import WorklogEntry
+from autotempo.worklogs import apply_worklog_days, diff_worklogs, resume_from_journal
+
+DATE = "2025-01-06"
+WORKER = "JIRAUSER1"
+
+def entry(ticket, hours, comment="", account="CUSTOMER", component="Development"):
+    return WorklogEntry(DATE, int(hours * 3600), ticket, account, component, comment)
+
+def tempo_worklog(worklog_id, ticket, hours, comment="", account="CUSTOMER", component="Development", date=DATE):
+    return {
+        "tempoWorklogId": worklog_id,
+        "issue": {"key": ticket},
+        "started": f"{date} 00:00:00.000",
+        "timeSpentSeconds": int(hours * 3600),
+        "comment": comment or f"Working on issue {ticket}",
+        "attributes": {"_Initiative_": {"value": account}, "_Componenttool_": {"value": component}},
+    }
+
+def ids(worklogs):
+    return [worklog["tempoWorklogId"] for worklog in worklogs]
+
+def test_identical_days_need_no_changes():
+    existing = [tempo_worklog(1, "PROJ-1", 4, "a"), tempo_worklog(2, "PROJ-2", 4)]
+    assert diff_worklogs(existing, [entry("PROJ-2", 4), entry("PROJ-1", 4, "a")]) == ([], [], [])
+
+def test_duplicate_worklogs_are_matched_one_for_one():
+    existing = [tempo_worklog(1, "PROJ-1", 2, "a"), tempo_worklog(2, "PROJ-1", 2, "a"), tempo_worklog(3, "PROJ-1", 2, "a")]
+    worklogs_to_delete, worklogs_to_update, worklogs_to_add = diff_worklogs(existing, [entry("PROJ-1", 2, "a")] * 2)
+    assert (ids(worklogs_to_delete), worklogs_to_update, worklogs_to_add) == ([3], [], [])
+
+    worklogs_to_delete, worklogs_to_update, worklogs_to_add = diff_worklogs(existing[:1], [entry("PROJ-1", 2, "a")] * 3)
+    assert (worklogs_to_delete, worklogs_to_update, len(worklogs_to_add)) == ([], [], 2)
+
+def test_changed_comment_or_duration_is_an_update():
+    existing = [tempo_worklog(1, "PROJ-1", 4, "old"), tempo_worklog(2, "PROJ-2", 4)]
+    worklogs_to_delete, worklogs_to_update, worklogs_to_add = diff_worklogs(existing, [entry("PROJ-1", 4, "new"), entry("PROJ-2", 3)])
+    assert (worklogs_to_delete, worklogs_to_add) == ([], [])
+    assert [(worklog["tempoWorklogId"], new.comment, new.seconds) for worklog, new in worklogs_to_update] == [(1, "new", 14400), (2, "", 10800)]
+
+def test_changed_ticket_or_account_is_a_delete_and_an_add():
+    existing = [tempo_worklog(1, "PROJ-1", 4), tempo_worklog(2, "PROJ-2", 4)]
+    worklogs_to_delete, worklogs_to_update, worklogs_to_add = diff_worklogs(existing, [entry("PROJ-3", 4), entry("PROJ-2", 4, account="INTERNAL")])
+    assert ids(worklogs_to_delete) == [1, 2]
+    assert worklogs_to_update == []
+    assert [(new.ticket, new.account) for new in worklogs_to_add] == [("PROJ-3", "CUSTOMER"), ("PROJ-2", "INTERNAL")]
+
+def test_leftover_duplicates_are_updated_in_order():
+    existing = [tempo_worklog(1, "PROJ-1", 1, "x"), tempo_worklog(2, "PROJ-1", 1, "x"), tempo_worklog(3, "PROJ-1", 1, "x")]
+    worklogs_to_delete, worklogs_to_update, worklogs_to_add = diff_worklogs(existing, [entry("PROJ-1", 1, "x"), entry("PROJ-1", 2, "y")])
+    assert ids(worklogs_to_delete) == [3]
+    assert [(worklog["tempoWorklogId"], new.comment) for worklog, new in worklogs_to_update] == [(2, "y")]
+    assert worklogs_to_add == []
+
+class FakeTempo:
+    """Stands in for the Tempo calls of the worklogs module, keeping worklogs in memory."""
+    def __init__(self, monkeypatch, existing=(), fail_after=None):
+        self.worklogs = {worklog["tempoWorklogId"]: worklog for worklog in existing}
+        self.next_id = 100
+        self.writes = 0
+        # Writes fail like a dropped connection once this many have reached the server
+        self.fail_after = fail_after
+        monkeypatch.setattr(worklogs, "get_worker", lambda: WORKER)
+        monkeypatch.setattr(worklogs, "get_existing_worklogs", self.get_existing_worklogs)
+        monkeypatch.setattr(worklogs, "delete_worklogs", self.delete_worklogs)
+        monkeypatch.setattr(worklogs, "update_worklog", self.update_worklog)
+        monkeypatch.setattr(worklogs, "add_worklog", self.add_worklog)
+
+    def get_existing_worklogs(self, start_date, end_date, worker=None):
+        by_date = {}
+        for worklog in self.worklogs.values():
+            if start_date <= worklog["started"][:10] <= end_date:
+                by_date.setdefault(worklog["started"][:10], []).append(worklog)
+        return by_date
+
+    def _write(self, change):
+        change()
+        self.writes += 1
+        if self.fail_after is not None and self.writes >= self.fail_after:
+            raise FatalError("Connection lost")
+
+    def delete_worklogs(self, worklogs_to_delete, log=print):
+        for worklog in worklogs_to_delete:
+            self._write(lambda: self.worklogs.pop(worklog["tempoWorklogId"]))
+
+    def update_worklog(self, worklog_id, ticket, hours, account, component, date, comment="", log=print, worker=None):
+        self._write(lambda: self.worklogs.update({worklog_id: tempo_worklog(worklog_id, ticket, hours, comment, account, component, date)}))
+        return self.worklogs[worklog_id]
+
+    def add_worklog(self, ticket, hours, account, component, date, comment="", log=print, worker=None):
+        worklog_id = self.next_id
+        self.next_id += 1
+        self._write(lambda: self.worklogs.update({worklog_id: tempo_worklog(worklog_id, ticket, hours, comment, account, component, date)}))
+        return self.worklogs[worklog_id]
+
+    def day(self):
+        return sorted((worklog["issue"]["key"], worklog["timeSpentSeconds"], worklog["comment"]) for worklog in self.worklogs.values())
+
+def answer(monkeypatch, reply):
+    prompts = []
+    monkeypatch.setattr("builtins.input", lambda prompt: prompts.append(prompt) or reply)
+    return prompts
+
+def test_interrupted_day_is_compared_again_and_finished_without_duplicates(tmp_path, monkeypatch):
+    tempo = FakeTempo(monkeypatch, [tempo_worklog(1, "PROJ-1", 4, "old"), tempo_worklog(2, "PROJ-9", 4)], fail_after=2)
+    new_worklogs = {DATE: [entry("PROJ-1", 4, "new"), entry("PROJ-2", 2), entry("PROJ-3", 2)]}
+    journal = Journal(str(tmp_path / "journal"))
+    answer(monkeypatch, "yes")
+
+    # The delete of worklog 2 and the update of worklog 1 reach the server, then the connection drops
+    with pytest.raises(FatalError):
+        apply_worklog_days(new_worklogs, [DATE], journal=journal)
+    assert tempo.writes == 2
+
+    tempo.fail_after = None
+    journal = Journal(journal.path)
+    # The changes confirmed before are not asked again
+    prompts = answer(monkeypatch, "no")
+    assert apply_worklog_days(new_worklogs, [DATE], journal=journal) == [DATE]
+    assert prompts == []
+    assert tempo.day() == [("PROJ-1", 14400, "new"), ("PROJ-2", 7200, "Working on issue PROJ-2"), ("PROJ-3", 7200, "Working on issue PROJ-3")]
+    assert journal.completed_hash(WORKER, DATE) is not None
+
+def test_add_saved_before_the_connection_dropped_is_not_added_again(tmp_path, monkeypatch):
+    tempo = FakeTempo(monkeypatch, fail_after=1)
+    new_worklogs = {DATE: [entry("PROJ-1", 4), entry("PROJ-2", 4)]}
+    journal = Journal(str(tmp_path / "journal"))
+
+    with pytest.raises(FatalError):
+        apply_worklog_days(new_worklogs, [DATE], journal=journal)
+    tempo.fail_after = None
+    apply_worklog_days(new_worklogs, [DATE], journal=Journal(journal.path))
+    assert [ticket for ticket, _, _ in tempo.day()] == ["PROJ-1", "PROJ-2"]
+
+def test_resume_skips_applied_days_and_reports_interrupted_ones(tmp_path):
+    journal = Journal(str(tmp_path / "journal"))
+    journal.record_complete(WORKER, "2025-01-07", "applied")
+    journal.record_plan(WORKER, DATE, "interrupted", [{"tempoWorklogId": 5}], [], [entry("PROJ-1", 8)])
+    day_hashes = {DATE: "interrupted", "2025-01-07": "applied", "2025-01-08": "new"}
+    dates_to_compare, confirmed_ids = resume_from_journal(journal, WORKER, sorted(day_hashes), day_hashes)
+    assert dates_to_compare == [DATE, "2025-01-08"]
+    assert confirmed_ids == {DATE: {5}}
+
+def test_declined_days_are_not_returned_as_applied(monkeypatch):
+    tempo = FakeTempo(monkeypatch, [tempo_worklog(1, "PROJ-1", 8, "old")])
+    new_worklogs = {DATE: [entry("PROJ-1", 8, "new")], "2025-01-07": [WorklogEntry("2025-01-07", 28800, "PROJ-1", "CUSTOMER", "Development")]}
+    prompts = answer(monkeypatch, "no")
+    assert apply_worklog_days(new_worklogs, [DATE, "2025-01-07"]) == ["2025-01-07"]
+    assert len(prompts) == 1
+    assert tempo.worklogs[1]["comment"] == "old"
+    assert [worklog["started"][:10] for worklog in tempo.worklogs.values()] == [DATE, "2025-01-07"]